@@ -7,5 +7,21 @@ Homepage: https://github.com/Akascape/CTkColorPicker
 
 __version__ = '0.8.0'
 
-from .ctk_color_picker import AskColor
-from .ctk_color_picker_widget import CTkColorPicker
+__all__ = ["AskColor", "CTkColorPicker", "PickerGroup"]
+
+# the widgets are imported on first access (PEP 562), so importing the package does not load customtkinter and PIL
+def __getattr__(name):
+    if name == "AskColor":
+        from .ctk_color_picker import AskColor as value
+    elif name == "CTkColorPicker":
+        from .ctk_color_picker_widget import CTkColorPicker as value
+    elif name == "PickerGroup":
+        from .picker_group import PickerGroup as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    globals()[name] = value # later accesses do not go through __getattr__ anymore
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,494 @@
+# Color conversions of the CTk Color Picker (hex, rgb, hsv, hsl, oklab/oklch and brightness scaling)
+# Scalar functions are tuned for the widgets hot paths (a lookup table instead of string formatting, bytes.fromhex instead of int(..., 16)),
+# batch functions convert whole palettes at once and accept lists or numpy arrays (numpy arrays take a vectorized path).
+#
+# Conventions: rgb channels are integers in the range [0, 255], hue, saturation, value and lightness are floats in the range [0, 1].
+# Oklab/oklch colors use the ranges of the Oklab paper: lightness in [0, 1], a, b and chroma roughly in [-0.4, 0.4] (chroma >= 0), hue in [0, 1) like the other spaces.
+
+from colorsys import rgb_to_hsv as _rgb_to_hsv, rgb_to_hls as _rgb_to_hls, hls_to_rgb as _hls_to_rgb
+from math import atan2, cos, sin, hypot, tau
+import functools
+
+_HEX_DIGITS: tuple[str, ...] = tuple(f"{value:02x}" for value in range(256)) # channel value -> two lowercase hex digits
+
+_brightness_tables: dict[int, tuple[int, ...]] = {} # brightness -> table of the scaled channel values
+
+# linear srgb <-> oklab matrices (https://bottosson.github.io/posts/oklab/), the first one maps (l, a, b) to the cube roots of lms
+OKLAB_TO_LMS: tuple[tuple[float, ...], ...] = ((1.0, 0.3963377774, 0.2158037573), (1.0, -0.1055613458, -0.0638541728), (1.0, -0.0894841775, -1.2914855480))
+LMS_TO_LINEAR: tuple[tuple[float, ...], ...] = ((4.0767416621, -3.3077115913, 0.2309699292), (-1.2684380046, 2.6097574011, -0.3413193965), (-0.0041960863, -0.7034186147, 1.7076147010))
+LINEAR_TO_LMS: tuple[tuple[float, ...], ...] = ((0.4122214708, 0.5363325363, 0.0514459929), (0.2119034982, 0.6806995451, 0.1073969566), (0.0883024619, 0.2817188376, 0.6299787005))
+LMS_TO_OKLAB: tuple[tuple[float, ...], ...] = ((0.2104542553, 0.7936177850, -0.0040720468), (1.9779984951, -2.4285922050, 0.4505937099), (0.0259040371, 0.7827717662, -0.8086757660))
+
+_LINEAR_CHANNELS: tuple[float, ...] = tuple(value / 255 / 12.92 if value <= 10 else ((value / 255 + 0.055) / 1.055) ** 2.4 for value in range(256)) # 8-bit channel -> linear value
+ENCODING_STEPS: int = 4095 # resolution of the linear -> 8-bit table of the batch functions (results are within one level of the scalar functions)
+
+def _is_array(value) -> bool:
+    """
+    Tell whether a value is a numpy array (without importing numpy).
+    """
+    return getattr(value, "ndim", None) is not None
+
+def rgb_to_hex(color) -> str:
+    """
+    Convert a rgb color to a hex string.
+
+    params:
+        color: tuple[int, int, int] The color (r, g, b).
+    raises:
+        IndexError if a channel is above 255 (channels are not checked otherwise)
+    returns:
+        str The color as "#rrggbb" (lowercase).
+    """
+    return "#" + _HEX_DIGITS[color[0]] + _HEX_DIGITS[color[1]] + _HEX_DIGITS[color[2]]
+
+def hex_to_rgb(hex_color: str) -> list[int]:
+    """
+    Convert a hex string to a rgb color.
+
+    params:
+        hex_color: str The color as "#rrggbb" (any case).
+    raises:
+        ValueError if the string is not a valid hex color
+    returns:
+        list[int] The color [r, g, b].
+    """
+
+    if len(hex_color) != 7 or hex_color[0] != "#": raise ValueError(f"invalid hex color: {hex_color!r}") # fromhex skips whitespace, "#ff ff ff" must not parse
+    try:
+        data = bytes.fromhex(hex_color[1:]) # parses the three channels in one C call
+    except ValueError:
+        data = b""
+    if len(data) != 3: raise ValueError(f"invalid hex color: {hex_color!r}")
+    return list(data)
+
+def _brightness_table(brightness: int) -> tuple[int, ...]:
+    """
+    Get the table scaling every channel value to a brightness (built once per brightness).
+
+    params:
+        brightness: int The brightness in the range [0, 255].
+    raises:
+        None
+    returns:
+        tuple[int, ...] The 256 scaled channel values.
+    """
+
+    table = _brightness_tables.get(brightness)
+    if table is None:
+        scale = brightness / 255
+        table = _brightness_tables[brightness] = tuple(int(value * scale) for value in range(256))
+    return table
+
+def scale_brightness(color, brightness: int) -> list[int]:
+    """
+    Scale a rgb color to a brightness (255 keeps the color, 0 gives black).
+
+    params:
+        color: tuple[int, int, int] The color (r, g, b).
+        brightness: int The brightness in the range [0, 255].
+    raises:
+        None
+    returns:
+        list[int] The scaled color [r, g, b].
+    """
+
+    table = _brightness_table(brightness)
+    return [table[color[0]], table[color[1]], table[color[2]]]
+
+def rgb_to_hsv(color) -> tuple[float, float, float]:
+    """
+    Convert a rgb color to hsv.
+
+    params:
+        color: tuple[int, int, int] The color (r, g, b).
+    raises:
+        None
+    returns:
+        tuple[float, float, float] The hue, saturation and value.
+    """
+    return _rgb_to_hsv(color[0] / 255, color[1] / 255, color[2] / 255)
+
+def hsv_to_rgb(hue: float, saturation: float, value: float = 1.0) -> list[int]:
+    """
+    Convert a hsv color to a 8-bit rgb color.
+
+    params:
+        hue: float The hue in the range [0, 1).
+        saturation: float The saturation in the range [0, 1].
+        value: float The value in the range [0, 1].
+    raises:
+        None
+    returns:
+        list[int] The color [r, g, b].
+    """
+
+    sector = int(hue * 6.0) % 6
+    f = hue * 6.0 - int(hue * 6.0)
+    v = value * 255
+    p = round(v * (1.0 - saturation))
+    q = round(v * (1.0 - saturation * f))
+    t = round(v * (1.0 - saturation * (1.0 - f)))
+    v = round(v)
+
+    if sector == 0: return [v, t, p]
+    if sector == 1: return [q, v, p]
+    if sector == 2: return [p, v, t]
+    if sector == 3: return [p, q, v]
+    if sector == 4: return [t, p, v]
+    return [v, p, q]
+
+def rgb_to_hsl(color) -> tuple[float, float, float]:
+    """
+    Convert a rgb color to hsl.
+
+    params:
+        color: tuple[int, int, int] The color (r, g, b).
+    raises:
+        None
+    returns:
+        tuple[float, float, float] The hue, saturation and lightness.
+    """
+
+    hue, lightness, saturation = _rgb_to_hls(color[0] / 255, color[1] / 255, color[2] / 255)
+    return hue, saturation, lightness
+
+def hsl_to_rgb(hue: float, saturation: float, lightness: float) -> list[int]:
+    """
+    Convert a hsl color to a 8-bit rgb color.
+
+    params:
+        hue: float The hue in the range [0, 1).
+        saturation: float The saturation in the range [0, 1].
+        lightness: float The lightness in the range [0, 1].
+    raises:
+        None
+    returns:
+        list[int] The color [r, g, b].
+    """
+
+    r, g, b = _hls_to_rgb(hue, lightness, saturation)
+    return [round(r * 255), round(g * 255), round(b * 255)]
+
+def _encode_channel(value: float) -> int:
+    """
+    Convert a linear channel value to a 8-bit srgb channel (values outside of [0, 1] are clipped).
+    """
+
+    if value <= 0.0031308: return round(value * 12.92 * 255) if value > 0 else 0
+    return round((1.055 * value ** (1 / 2.4) - 0.055) * 255) if value < 1 else 255
+
+def rgb_to_oklch(color) -> tuple[float, float, float]:
+    """
+    Convert a rgb color to oklch.
+
+    params:
+        color: tuple[int, int, int] The color (r, g, b).
+    raises:
+        None
+    returns:
+        tuple[float, float, float] The lightness, chroma and hue (the hue of grays is 0).
+    """
+
+    r, g, b = _LINEAR_CHANNELS[color[0]], _LINEAR_CHANNELS[color[1]], _LINEAR_CHANNELS[color[2]]
+    l, m, s = ((row[0] * r + row[1] * g + row[2] * b) ** (1 / 3) for row in LINEAR_TO_LMS)
+    lightness, a, b = (row[0] * l + row[1] * m + row[2] * s for row in LMS_TO_OKLAB)
+    chroma = hypot(a, b)
+    return lightness, chroma, (atan2(b, a) / tau) % 1.0 if chroma > 1e-6 else 0.0
+
+def oklab_to_linear_rgb(lightness: float, a: float, b: float) -> tuple[float, float, float]:
+    """
+    Convert an oklab color to linear srgb, without clipping (used to test whether a color is inside the srgb gamut).
+
+    params:
+        lightness: float The lightness in the range [0, 1].
+        a: float The green-red axis.
+        b: float The blue-yellow axis.
+    raises:
+        None
+    returns:
+        tuple[float, float, float] The linear r, g and b (outside of [0, 1] for colors out of the gamut).
+    """
+
+    l, m, s = ((row[0] * lightness + row[1] * a + row[2] * b) ** 3 for row in OKLAB_TO_LMS)
+    return tuple(row[0] * l + row[1] * m + row[2] * s for row in LMS_TO_LINEAR)
+
+def oklch_to_rgb(lightness: float, chroma: float, hue: float) -> list[int]:
+    """
+    Convert an oklch color to a 8-bit rgb color (colors out of the srgb gamut are clipped per channel).
+
+    params:
+        lightness: float The lightness in the range [0, 1].
+        chroma: float The chroma.
+        hue: float The hue in the range [0, 1).
+    raises:
+        None
+    returns:
+        list[int] The color [r, g, b].
+    """
+
+    r, g, b = oklab_to_linear_rgb(lightness, chroma * cos(hue * tau), chroma * sin(hue * tau))
+    return [_encode_channel(r), _encode_channel(g), _encode_channel(b)]
+
+def rgb_to_hex_batch(colors):
+    """
+    Convert many rgb colors to hex strings.
+
+    params:
+        colors: list[tuple[int, int, int]] | numpy.ndarray The colors (an array of shape (..., 3)).
+    raises:
+        ValueError if a channel of a list is out of the range [0, 255] (arrays are cast to uint8)
+    returns:
+        list[str] The colors as "#rrggbb" (a flat list, in order).
+    """
+
+    if _is_array(colors):
+        import numpy
+        data = numpy.ascontiguousarray(colors, dtype=numpy.uint8).tobytes().hex()
+    else:
+        data = bytes(channel for color in colors for channel in color[:3]).hex()
+    return ["#" + data[i:i + 6] for i in range(0, len(data), 6)]
+
+def hex_to_rgb_batch(hex_colors, as_array: bool = False):
+    """
+    Convert many hex strings to rgb colors.
+
+    params:
+        hex_colors: list[str] | numpy.ndarray The colors as "#rrggbb" (any case).
+        as_array: bool Return an uint8 numpy array of shape (n, 3) instead of a list.
+    raises:
+        ValueError if a string is not a valid hex color
+    returns:
+        list[list[int]] | numpy.ndarray The colors.
+    """
+
+    if any(len(hex_color) != 7 or hex_color[0] != "#" for hex_color in hex_colors): raise ValueError("invalid hex color in batch")
+    data = bytes.fromhex("".join(hex_color[1:] for hex_color in hex_colors)) # parses every color in one C call
+    if len(data) != 3 * len(hex_colors): raise ValueError("invalid hex color in batch") # whitespace skipped by fromhex
+
+    if as_array or _is_array(hex_colors):
+        import numpy
+        return numpy.frombuffer(data, dtype=numpy.uint8).reshape(-1, 3).copy()
+    return [list(data[i:i + 3]) for i in range(0, len(data), 3)]
+
+def scale_brightness_batch(colors, brightness: int):
+    """
+    Scale many rgb colors to a brightness.
+
+    params:
+        colors: list[tuple[int, int, int]] | numpy.ndarray The colors (an array of shape (..., 3)).
+        brightness: int The brightness in the range [0, 255].
+    raises:
+        None
+    returns:
+        list[list[int]] | numpy.ndarray The scaled colors (same type as the input).
+    """
+
+    table = _brightness_table(brightness)
+    if _is_array(colors):
+        import numpy
+        return numpy.asarray(table, dtype=numpy.uint8)[numpy.asarray(colors, dtype=numpy.uint8)] # the table is applied with a single fancy indexing pass
+    return [[table[color[0]], table[color[1]], table[color[2]]] for color in colors]
+
+def rgb_to_hsv_batch(colors):
+    """
+    Convert many rgb colors to hsv.
+
+    params:
+        colors: list[tuple[int, int, int]] | numpy.ndarray The colors (an array of shape (..., 3)).
+    raises:
+        None
+    returns:
+        list[tuple[float, float, float]] | numpy.ndarray The hue, saturation and value of every color (float64 array of shape (..., 3) for array input).
+    """
+
+    if not _is_array(colors): return [rgb_to_hsv(color) for color in colors]
+
+    import numpy
+    rgb = numpy.asarray(colors, dtype=numpy.float64) / 255
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    maximum, minimum = rgb.max(axis=-1), rgb.min(axis=-1)
+    delta = maximum - minimum
+    safe_delta = numpy.where(delta == 0, 1.0, delta)
+
+    hue = numpy.select([maximum == r, maximum == g], [(g - b) / safe_delta, 2.0 + (b - r) / safe_delta], 4.0 + (r - g) / safe_delta)
+    hue = numpy.where(delta == 0, 0.0, numpy.mod(hue / 6.0, 1.0))
+    saturation = numpy.where(maximum == 0, 0.0, delta / numpy.where(maximum == 0, 1.0, maximum))
+    return numpy.stack((hue, saturation, maximum), axis=-1)
+
+def hsv_to_rgb_batch(hue, saturation, value = 1.0):
+    """
+    Convert many hsv colors to 8-bit rgb colors, giving the same values as hsv_to_rgb.
+
+    params:
+        hue: list[float] | numpy.ndarray The hues in the range [0, 1).
+        saturation: list[float] | numpy.ndarray The saturations in the range [0, 1].
+        value: float | list[float] | numpy.ndarray The values in the range [0, 1].
+    raises:
+        None
+    returns:
+        numpy.ndarray The colors as an uint8 array with a trailing axis of size 3 (a list of [r, g, b] if no argument is a numpy array).
+    """
+
+    if not any(_is_array(argument) for argument in (hue, saturation, value)):
+        values = value if isinstance(value, (list, tuple)) else [value] * len(hue)
+        return [hsv_to_rgb(h, s, v) for h, s, v in zip(hue, saturation, values)]
+
+    import numpy
+    hue, saturation = numpy.asarray(hue, dtype=numpy.float64), numpy.asarray(saturation, dtype=numpy.float64)
+    h6 = hue * 6.0
+    sector = numpy.floor(h6)
+    f = h6 - sector
+    sector = sector.astype(numpy.intp) % 6
+
+    v = numpy.asarray(value, dtype=numpy.float64) * 255
+    p = numpy.rint(v * (1.0 - saturation))
+    q = numpy.rint(v * (1.0 - saturation * f))
+    t = numpy.rint(v * (1.0 - saturation * (1.0 - f)))
+    v = numpy.broadcast_to(numpy.rint(v), p.shape)
+
+    r = numpy.choose(sector, (v, q, p, p, t, v))
+    g = numpy.choose(sector, (t, v, v, q, p, p))
+    b = numpy.choose(sector, (p, p, t, v, v, q))
+    return numpy.stack((r, g, b), axis=-1).astype(numpy.uint8)
+
+def rgb_to_hsl_batch(colors):
+    """
+    Convert many rgb colors to hsl.
+
+    params:
+        colors: list[tuple[int, int, int]] | numpy.ndarray The colors (an array of shape (..., 3)).
+    raises:
+        None
+    returns:
+        list[tuple[float, float, float]] | numpy.ndarray The hue, saturation and lightness of every color (float64 array of shape (..., 3) for array input).
+    """
+
+    if not _is_array(colors): return [rgb_to_hsl(color) for color in colors]
+
+    import numpy
+    hsv = rgb_to_hsv_batch(colors)
+    rgb = numpy.asarray(colors, dtype=numpy.float64) / 255
+    maximum, minimum = rgb.max(axis=-1), rgb.min(axis=-1)
+    lightness = (maximum + minimum) / 2
+    delta = maximum - minimum
+    denominator = numpy.where(lightness <= 0.5, maximum + minimum, 2.0 - maximum - minimum)
+    saturation = numpy.where(delta == 0, 0.0, delta / numpy.where(denominator == 0, 1.0, denominator))
+    return numpy.stack((hsv[..., 0], saturation, lightness), axis=-1)
+
+def hsl_to_rgb_batch(hue, saturation, lightness):
+    """
+    Convert many hsl colors to 8-bit rgb colors.
+
+    params:
+        hue: list[float] | numpy.ndarray The hues in the range [0, 1).
+        saturation: list[float] | numpy.ndarray The saturations in the range [0, 1].
+        lightness: list[float] | numpy.ndarray The lightnesses in the range [0, 1].
+    raises:
+        None
+    returns:
+        numpy.ndarray The colors as an uint8 array with a trailing axis of size 3 (a list of [r, g, b] if no argument is a numpy array).
+    """
+
+    if not any(_is_array(argument) for argument in (hue, saturation, lightness)):
+        return [hsl_to_rgb(h, s, l) for h, s, l in zip(hue, saturation, lightness)]
+
+    # hsl is hsv with value = l + s * min(l, 1 - l) and saturation = 2 * (1 - l / value)
+    import numpy
+    saturation, lightness = numpy.asarray(saturation, dtype=numpy.float64), numpy.asarray(lightness, dtype=numpy.float64)
+    value = lightness + saturation * numpy.minimum(lightness, 1.0 - lightness)
+    hsv_saturation = numpy.where(value == 0, 0.0, 2.0 * (1.0 - lightness / numpy.where(value == 0, 1.0, value)))
+    return hsv_to_rgb_batch(hue, hsv_saturation, value)
+
+@functools.lru_cache(maxsize=None)
+def encoding_table():
+    """
+    Get the table converting linear values quantized to ENCODING_STEPS to 8-bit srgb channels (needs numpy).
+    Index it with round(value * ENCODING_STEPS) for values clipped to [0, 1].
+    """
+
+    import numpy
+    return numpy.array([_encode_channel(step / ENCODING_STEPS) for step in range(ENCODING_STEPS + 1)], dtype=numpy.uint8)
+
+def rgb_to_oklch_batch(colors):
+    """
+    Convert many rgb colors to oklch.
+
+    params:
+        colors: list[tuple[int, int, int]] | numpy.ndarray The colors (an array of shape (..., 3)).
+    raises:
+        None
+    returns:
+        list[tuple[float, float, float]] | numpy.ndarray The lightness, chroma and hue of every color (float64 array of shape (..., 3) for array input).
+    """
+
+    if not _is_array(colors): return [rgb_to_oklch(color) for color in colors]
+
+    import numpy
+    linear = numpy.asarray(_LINEAR_CHANNELS)[numpy.asarray(colors, dtype=numpy.uint8)]
+    lab = numpy.cbrt(linear @ numpy.asarray(LINEAR_TO_LMS).T) @ numpy.asarray(LMS_TO_OKLAB).T
+    chroma = numpy.hypot(lab[..., 1], lab[..., 2])
+    hue = numpy.where(chroma > 1e-6, numpy.mod(numpy.arctan2(lab[..., 2], lab[..., 1]) / tau, 1.0), 0.0)
+    return numpy.stack((lab[..., 0], chroma, hue), axis=-1)
+
+def oklab_to_linear_rgb_batch(lightness, a, b):
+    """
+    Convert many oklab colors to linear srgb, without clipping (needs numpy).
+
+    params:
+        lightness: float | numpy.ndarray The lightnesses in the range [0, 1].
+        a: numpy.ndarray The green-red axis.
+        b: numpy.ndarray The blue-yellow axis.
+    raises:
+        None
+    returns:
+        numpy.ndarray The linear colors as a float64 array with a trailing axis of size 3.
+    """
+
+    import numpy
+    a, b = numpy.asarray(a, dtype=numpy.float64), numpy.asarray(b, dtype=numpy.float64)
+    lab = numpy.stack(numpy.broadcast_arrays(numpy.asarray(lightness, dtype=numpy.float64), a, b), axis=-1)
+    lms = lab @ numpy.asarray(OKLAB_TO_LMS).T # one matrix product per step instead of nine scalar expressions
+    return (lms * lms * lms) @ numpy.asarray(LMS_TO_LINEAR).T
+
+def oklab_to_rgb_batch(lightness, a, b):
+    """
+    Convert many oklab colors to 8-bit rgb colors (colors out of the srgb gamut are clipped per channel, needs numpy).
+    The srgb transfer function is applied with a lookup table, channels are within one level of oklch_to_rgb.
+
+    params:
+        lightness: float | numpy.ndarray The lightnesses in the range [0, 1].
+        a: numpy.ndarray The green-red axis.
+        b: numpy.ndarray The blue-yellow axis.
+    raises:
+        None
+    returns:
+        numpy.ndarray The colors as an uint8 array with a trailing axis of size 3.
+    """
+
+    import numpy
+    linear = oklab_to_linear_rgb_batch(lightness, a, b)
+    numpy.clip(linear, 0.0, 1.0, out=linear)
+    linear *= ENCODING_STEPS
+    return encoding_table()[(linear + 0.5).astype(numpy.intp)]
+
+def oklch_to_rgb_batch(lightness, chroma, hue):
+    """
+    Convert many oklch colors to 8-bit rgb colors (colors out of the srgb gamut are clipped per channel).
+
+    params:
+        lightness: float | list[float] | numpy.ndarray The lightnesses in the range [0, 1].
+        chroma: list[float] | numpy.ndarray The chromas.
+        hue: list[float] | numpy.ndarray The hues in the range [0, 1).
+    raises:
+        None
+    returns:
+        numpy.ndarray The colors as an uint8 array with a trailing axis of size 3 (a list of [r, g, b] if no argument is a numpy array).
+    """
+
+    if not any(_is_array(argument) for argument in (lightness, chroma, hue)):
+        lightnesses = lightness if isinstance(lightness, (list, tuple)) else [lightness] * len(hue)
+        return [oklch_to_rgb(l, c, h) for l, c, h in zip(lightnesses, chroma, hue)]
+
+    import numpy
+    chroma, angle = numpy.asarray(chroma, dtype=numpy.float64), numpy.asarray(hue, dtype=numpy.float64) * tau
+    return oklab_to_rgb_batch(lightness, chroma * numpy.cos(angle), chroma * numpy.sin(angle))
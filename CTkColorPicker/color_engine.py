@@ -0,0 +1,258 @@
+# GUI independent state of a CTk Color Picker
+# Owns the target position, the brightness and the picked color, and the math of the hot paths (drag, brightness, color lookup).
+# AskColor and CTkColorPicker are views over it, so it can be used and benchmarked without tkinter.
+
+from math import atan2, cos, sin, hypot
+from .wheel_model import coords_to_hs, coords_to_rgb, hs_to_coords, rgb_to_coords
+from .color_conversion import rgb_to_hex, scale_brightness
+from . import oklch_model
+
+COLOR_SPACES: tuple[str, ...] = ("rgb", "oklch") # wheel models of the pickers
+
+NUDGE_STEPS: tuple[float, float, int] = (1 / 360, 0.01, 1) # hue, saturation and brightness change of one nudge
+NUDGE_KEYS: dict[str, tuple[int, int, int]] = {"Left": (-1, 0, 0), "Right": (1, 0, 0), "Up": (0, 1, 0), "Down": (0, -1, 0),
+                                               "Prior": (0, 0, 1), "Next": (0, 0, -1), "plus": (0, 0, 1), "minus": (0, 0, -1)} # key -> number of hue, saturation and brightness steps
+
+class ColorPickerState:
+    """
+    State of a color picker wheel of a given size.
+
+    attributes:
+        dimension: int The size of the wheel in pixels.
+        target_x, target_y: float The position of the target on the wheel.
+        brightness: int The brightness in the range [0, 255] (the oklch lightness level in the "oklch" color space).
+        rgb_color: list[int] The picked color [r, g, b] (brightness applied).
+        hex_color: str The picked color as a hex string.
+        color_space: str "rgb" for the hsv wheel, "oklch" for the perceptual wheel.
+        typed: tuple[int, float, float, float] The level, lightness, relative chroma and hue of the color given to set_color on the perceptual wheel,
+            kept until the target moves so the color is not clamped to the rim (None otherwise, see oklch_model.rgb_to_lsh).
+    """
+
+    __slots__ = ("dimension", "target_x", "target_y", "brightness", "rgb_color", "hex_color", "color_space", "typed")
+
+    def __init__(self, dimension: int, brightness: int = 255, color_space: str = "rgb") -> None:
+        """
+        Create the state with the target in the center of the wheel (white).
+
+        params:
+            dimension: int The size of the wheel in pixels.
+            brightness: int The brightness in the range [0, 255].
+            color_space: str "rgb" for the hsv wheel, "oklch" for the perceptual wheel (same geometry, chroma relative to the srgb gamut, the brightness is the lightness).
+        raises:
+            ValueError if the color space is unknown
+        returns:
+            None
+        """
+
+        if color_space not in COLOR_SPACES: raise ValueError(f"color_space must be 'rgb' or 'oklch', not {color_space!r}")
+        self.color_space: str = color_space
+        self.typed: tuple[int, float, float, float] = None
+        self.dimension: int = dimension
+        self.target_x: float = dimension / 2
+        self.target_y: float = dimension / 2
+        self.brightness: int = brightness
+        self.rgb_color: list[int] = [255, 255, 255]
+        self.hex_color: str = "#ffffff"
+        self.update_color()
+
+    @property
+    def position(self) -> tuple[float, float]:
+        """
+        The position of the target on the wheel.
+        """
+        return self.target_x, self.target_y
+
+    def move_to(self, x: float, y: float) -> str:
+        """
+        Move the target to a pointer position and update the color.
+        Positions outside of the wheel are projected on its rim, so the pointer is still tracked when it leaves the wheel.
+
+        params:
+            x: float The x-coordinate of the pointer.
+            y: float The y-coordinate of the pointer.
+        raises:
+            None
+        returns:
+            str The new hex color.
+        """
+
+        self.typed = None
+        radius = self.dimension / 2
+        if hypot(radius - x, radius - y) < radius: # inside the wheel
+            self.target_x, self.target_y = x, y
+        else:
+            self.target_x, self.target_y = projection_on_circle(x, y, radius, radius, radius - 1)
+        return self.update_color()
+
+    def nudge(self, hue_step: float = 0.0, saturation_step: float = 0.0) -> str:
+        """
+        Move the target by a hue and saturation step from its current position and update the color.
+        The hue wraps around the wheel, the saturation is clamped between the center and the rim. Without steps the target stays (brightness nudges).
+
+        params:
+            hue_step: float The hue change (a full turn is 1.0).
+            saturation_step: float The saturation change (the center to the rim is 1.0).
+        raises:
+            None
+        returns:
+            str The new hex color.
+        """
+
+        if hue_step or saturation_step:
+            self.typed = None
+            hue, saturation = coords_to_hs(self.target_x, self.target_y, self.dimension)
+            saturation = min(max(saturation + saturation_step, 0.0), (self.dimension / 2 - 1) / (self.dimension / 2)) # same rim as move_to
+            self.target_x, self.target_y = hs_to_coords((hue + hue_step) % 1.0, saturation, self.dimension)
+        return self.update_color()
+
+    def set_brightness(self, brightness: int) -> str:
+        """
+        Change the brightness and update the color.
+
+        params:
+            brightness: int The brightness in the range [0, 255].
+        raises:
+            None
+        returns:
+            str The new hex color.
+        """
+
+        self.brightness = brightness
+        return self.update_color()
+
+    def resize(self, dimension: int) -> None:
+        """
+        Change the size of the wheel, the target keeps its hue and saturation (the picked color is unchanged).
+
+        params:
+            dimension: int The new size of the wheel in pixels.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        hue, saturation = coords_to_hs(self.target_x, self.target_y, self.dimension)
+        self.dimension = dimension
+        self.target_x, self.target_y = hs_to_coords(hue, saturation, dimension)
+
+    def wheel_color(self) -> list[int]:
+        """
+        Get the color of the wheel under the target (full brightness, the perceptual wheel is at the lightness of the brightness).
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            list[int] The color [r, g, b].
+        """
+
+        if self.color_space == "oklch": return oklch_model.coords_to_rgb(self.target_x, self.target_y, self.dimension, self.brightness)
+        return coords_to_rgb(self.target_x, self.target_y, self.dimension)
+
+    def update_color(self) -> str:
+        """
+        Compute the picked color from the target position and the brightness.
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            str The new hex color.
+        """
+
+        if self.typed is not None: # exact at the level of the typed color, its relative chroma at the other levels
+            level, lightness, saturation, hue = self.typed
+            if self.brightness != level: lightness = oklch_model.level_to_lightness(self.brightness)
+            self.rgb_color = oklch_model.lsh_to_rgb(lightness, saturation, hue, self.brightness)
+        else: self.rgb_color = self.wheel_color() if self.color_space == "oklch" else scale_brightness(self.wheel_color(), self.brightness)
+        self.hex_color = rgb_to_hex(self.rgb_color)
+        return self.hex_color
+
+    def set_color(self, color) -> None:
+        """
+        Set the picked color and move the target to its hue and saturation.
+        The brightness is left unchanged (the perceptual wheel depends on it, so it takes the lightness level of the color), the color is stored as given
+        and on the perceptual wheel it is kept, with its chroma, until the target moves (colors sharper than the rim are not clamped to it).
+
+        params:
+            color: tuple[int, int, int] The color (r, g, b).
+        raises:
+            None
+        returns:
+            None
+        """
+
+        self.rgb_color = [color[0], color[1], color[2]]
+        self.hex_color = rgb_to_hex(self.rgb_color)
+        self.target_x, self.target_y = self.find_coords(self.rgb_color)
+        if self.color_space == "oklch":
+            self.brightness = oklch_model.rgb_to_level(self.rgb_color)
+            self.typed = (self.brightness, *oklch_model.rgb_to_lsh(self.rgb_color))
+
+    def find_coords(self, color) -> tuple[float, float]:
+        """
+        Find the position of a color on the wheel (its brightness is ignored).
+
+        params:
+            color: tuple[int, int, int] The color (r, g, b).
+        raises:
+            None
+        returns:
+            tuple[float, float] The x and y coordinates of the color.
+        """
+
+        if self.color_space == "oklch": return oklch_model.rgb_to_coords(color, self.dimension)
+        return rgb_to_coords(color, self.dimension)
+
+    def brightness_of(self, color) -> int:
+        """
+        Get the brightness showing a color (its largest channel, its oklch lightness level in the "oklch" color space).
+
+        params:
+            color: tuple[int, int, int] The color (r, g, b).
+        raises:
+            None
+        returns:
+            int The brightness in the range [0, 255].
+        """
+
+        if self.color_space == "oklch": return oklch_model.rgb_to_level(color)
+        return max(color)
+
+    def text_color(self) -> str:
+        """
+        Get the text color readable on top of the picked color.
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            str "white" for dark colors, "black" otherwise.
+        """
+
+        if self.color_space == "oklch": return "white" if self.brightness < 150 else "black" # the lightness is perceptual, mid gray is about 153
+        return "white" if self.brightness < 70 or self.hex_color == "#000000" else "black"
+
+def projection_on_circle(point_x: float, point_y: float, circle_x: float, circle_y: float, radius: float) -> tuple[float, float]:
+    """
+    Get the projection of a point on a circle.
+    Used to figure out the closest point on the circle to the given point to place the target on the color wheel even if the user presses outside of it.
+
+    params:
+        point_x: float The x-coordinate of the point.
+        point_y: float The y-coordinate of the point.
+        circle_x: float The x-coordinate of the center of the circle.
+        circle_y: float The y-coordinate of the center of the circle.
+        radius: float The radius of the circle.
+    raises:
+        None
+    returns:
+        tuple[float, float] The x and y coordinates of the projection.
+    """
+
+    angle = atan2(point_y - circle_y, point_x - circle_x)
+    return circle_x + radius * cos(angle), circle_y + radius * sin(angle)
@@ -0,0 +1,154 @@
+# Dispatcher of the user command of the CTk Color Picker widget
+# Decides when the command runs (every change, debounced or throttled) and where it runs (tk thread or executor).
+
+from concurrent.futures import Executor, Future
+import time
+
+class CommandDispatcher:
+    """
+    Call a command with the picked color according to a dispatch policy.
+
+    policy:
+        "immediate" the command is called on every notification (default).
+        "debounce" the command is called once the color stopped changing for delay milliseconds.
+        "throttle" the command is called at most once every delay milliseconds, the last color is always delivered.
+    """
+
+    POLL_INTERVAL: int = 10 # milliseconds between two checks of a running executor job
+
+    def __init__(self,
+                 widget,
+                 command,
+                 on_change: bool = False,
+                 policy: str = "immediate",
+                 delay: int = 0,
+                 executor: Executor = None,
+                 result_callback = None,
+                 instrumentation = None) -> None:
+        """
+        params:
+            widget: tkinter.Misc Widget used to schedule the calls on the tk event loop.
+            command: callable Function called with the color, None disables the dispatcher.
+            on_change: bool Only call the command when the color is different from the last dispatched one.
+            policy: str "immediate", "debounce" or "throttle".
+            delay: int Debounce or throttle delay in milliseconds.
+            executor: concurrent.futures.Executor Run the command in this executor instead of the tk thread.
+            result_callback: callable Called on the tk thread with the value returned by the command.
+            instrumentation: Instrumentation Measures the time spent in the command ("callback" stage) and counts the calls and the dropped colors.
+        raises:
+            ValueError if the policy is unknown
+        returns:
+            None
+        """
+
+        if policy not in ("immediate", "debounce", "throttle"): raise ValueError(f"policy must be 'immediate', 'debounce' or 'throttle', not {policy!r}")
+
+        self.widget = widget
+        self.command = command
+        self.on_change: bool = on_change
+        self.policy: str = policy
+        self.delay: int = delay
+        self.executor: Executor = executor
+        self.result_callback = result_callback
+        self.instrumentation = instrumentation
+
+        self._last_color: str = None # last color given to the command
+        self._pending_color: str = None # color waiting for the debounce/throttle timer
+        self._job: str = None # id of the debounce/throttle timer
+        self._last_call: float = 0.0 # time of the last call (throttle policy)
+        self._futures: list[Future] = [] # executor jobs whose result was not delivered yet
+        self._poll_job: str = None # id of the executor polling timer
+
+    def notify(self, color: str) -> None:
+        """
+        Tell the dispatcher the picked color changed.
+
+        params:
+            color: str The new color.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        if self.command is None: return
+
+        if self.policy == "immediate" or self.delay <= 0:
+            self._dispatch(color)
+        elif self.policy == "debounce":
+            if self.instrumentation and self._pending_color is not None: self.instrumentation.count("commands_dropped") # replaced before it was dispatched
+            self._pending_color = color
+            if self._job is not None: self.widget.after_cancel(self._job) # restart the quiet period
+            self._job = self.widget.after(self.delay, self._flush)
+        else: # throttle
+            if self.instrumentation and self._pending_color is not None: self.instrumentation.count("commands_dropped")
+            self._pending_color = color
+            if self._job is not None: return # the trailing call is already scheduled and will use the latest color
+
+            remaining = self.delay - int((time.perf_counter() - self._last_call) * 1000)
+            if remaining <= 0: self._flush() # leading call
+            else: self._job = self.widget.after(remaining, self._flush) # trailing call
+
+    def _flush(self) -> None:
+        """
+        Dispatch the color waiting for the debounce/throttle timer.
+        """
+
+        self._job = None
+        color, self._pending_color = self._pending_color, None
+        if color is not None: self._dispatch(color)
+
+    def _dispatch(self, color: str) -> None:
+        """
+        Call the command with a color (skipping unchanged colors if requested).
+
+        params:
+            color: str The color.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        instrumentation = self.instrumentation
+        if self.on_change and color == self._last_color:
+            if instrumentation: instrumentation.count("commands_dropped")
+            return
+        self._last_color = color
+        self._last_call = time.perf_counter()
+        if instrumentation:
+            instrumentation.count("commands_called")
+            start = instrumentation.now()
+
+        if self.executor is None:
+            result = self.command(color)
+            if self.result_callback: self.result_callback(result)
+        else: # only the submission is measured, the command itself runs in the executor
+            self._futures.append(self.executor.submit(self.command, color))
+            if self._poll_job is None: self._poll_job = self.widget.after(self.POLL_INTERVAL, self._poll)
+
+        if instrumentation: instrumentation.record("callback", start)
+
+    def _poll(self) -> None:
+        """
+        Deliver the results of the finished executor jobs on the tk thread, in submission order.
+        """
+
+        self._poll_job = None
+        try:
+            while self._futures and self._futures[0].done():
+                result = self._futures.pop(0).result() # exceptions of the command are raised here, inside the tk callback
+                if self.result_callback: self.result_callback(result)
+        finally:
+            if self._futures: self._poll_job = self.widget.after(self.POLL_INTERVAL, self._poll)
+
+    def cancel(self) -> None:
+        """
+        Cancel the scheduled calls and stop delivering executor results (used when the widget is destroyed).
+        """
+
+        for job in (self._job, self._poll_job):
+            if job is not None: self.widget.after_cancel(job)
+        self._job = self._poll_job = None
+        self._pending_color = None
+        self._futures.clear()
@@ -4,14 +4,19 @@
 
 import tkinter
 import customtkinter
-from PIL import Image, ImageTk
 import sys
-import os
-import math
+from concurrent.futures import Future
+from .color_engine import ColorPickerState
+from .color_conversion import hex_to_rgb
+from .palette_panel import PalettePanel
+from .disk_cache import RecentColors
+from .vector_target import VectorTarget
+from .picker_view import ColorPickerView
 
-PATH = os.path.dirname(os.path.realpath(__file__))
-
-class AskColor(customtkinter.CTkToplevel):
+class AskColor(ColorPickerView, customtkinter.CTkToplevel):
+    
+    _pool = {} # hidden reusable dialogs of pooled(), by options
+    _pool_key = None # options of a dialog created by pooled(), it goes back to the pool when it is closed
 
     def __init__(self,
                  width: int = 300,
@@ -24,13 +29,27 @@ class AskColor(customtkinter.CTkToplevel):
                  text: str = "OK",
                  corner_radius: int = 24,
                  slider_border: int = 1,
+                 update_mode: str = "immediate",
+                 max_fps: int = 60,
+                 live_brightness: bool = False,
+                 palette: list = None,
+                 palette_rows: int = 2,
+                 cache_dir: str = None,
+                 modal: bool = True,
+                 reusable: bool = False,
+                 instrumentation = None,
+                 target_style: str = "image",
+                 color_space: str = "rgb",
                  **button_kwargs):
     
+        self._check_options(update_mode, target_style, color_space) # before the window is created
         super().__init__()
         
         self.title(title)
         WIDTH = width if width>=200 else 200
         HEIGHT = WIDTH + 150
+        if palette is not None:
+            HEIGHT += palette_rows * 24 + 20
         self.image_dimension = self._apply_window_scaling(WIDTH - 100)
         self.target_dimension = self._apply_window_scaling(20)
         
@@ -44,9 +63,16 @@ class AskColor(customtkinter.CTkToplevel):
         self.after(10)
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
         
-        self.default_hex_color = "#ffffff"  
-        self.default_rgb = [255, 255, 255]
-        self.rgb_color = self.default_rgb[:]
+        self.color_state = ColorPickerState(self.image_dimension, color_space=color_space)
+        self.color_space = color_space
+        self.cache_dir = cache_dir
+        self.modal = modal
+        self.reusable = reusable
+        self.instrumentation = instrumentation
+        self._color = None
+        self._future = Future()
+        self._closed = tkinter.BooleanVar(self, False)
+        self.recent_colors = RecentColors(cache_dir)
         
         self.bg_color = self._apply_appearance_mode(customtkinter.ThemeManager.theme["CTkFrame"]["fg_color"]) if bg_color is None else bg_color
         self.fg_color = self.fg_color = self._apply_appearance_mode(customtkinter.ThemeManager.theme["CTkFrame"]["top_fg_color"]) if fg_color is None else fg_color
@@ -56,153 +82,204 @@ class AskColor(customtkinter.CTkToplevel):
         self.corner_radius = corner_radius
         self.slider_border = 10 if slider_border>=10 else slider_border
         
+        self._init_updates(update_mode, max_fps)
+        
         self.config(bg=self.bg_color)
         
         self.frame = customtkinter.CTkFrame(master=self, fg_color=self.fg_color, bg_color=self.bg_color)
         self.frame.grid(padx=20, pady=20, sticky="nswe")
           
-        self.canvas = tkinter.Canvas(self.frame, height=self.image_dimension, width=self.image_dimension, highlightthickness=0, bg=self.fg_color)
+        self.canvas = tkinter.Canvas(self.frame, height=self.image_dimension, width=self.image_dimension, highlightthickness=0, bg=self.fg_color, takefocus=1)
         self.canvas.pack(pady=20)
+        self.canvas.bind("<Button-1>", self.on_mouse_press)
         self.canvas.bind("<B1-Motion>", self.on_mouse_drag)
+        self.canvas.bind("<KeyPress>", self.on_key_nudge)
+        for sequence in ("<MouseWheel>", "<Shift-MouseWheel>", "<Button-4>", "<Button-5>", "<Shift-Button-4>", "<Shift-Button-5>"):
+            self.canvas.bind(sequence, self.on_mouse_wheel)
+        self.canvas.bind("<Map>", self.load_images)
 
-        self.img1 = Image.open(os.path.join(PATH, 'color_wheel.png')).resize((self.image_dimension, self.image_dimension), Image.Resampling.LANCZOS)
-        self.img2 = Image.open(os.path.join(PATH, 'target.png')).resize((self.target_dimension, self.target_dimension), Image.Resampling.LANCZOS)
-
-        self.wheel = ImageTk.PhotoImage(self.img1)
-        self.target = ImageTk.PhotoImage(self.img2)
+        self.image_scaling = self._get_window_scaling()
+        # the perceptual wheel always follows the lightness of the slider
+        self.live_brightness = live_brightness or color_space == "oklch"
+        self.shown_brightness = 255
+        self.color_wheel_image = self.target_image = None
+        self.wheel = self.target = None
         
-        self.canvas.create_image(self.image_dimension/2, self.image_dimension/2, image=self.wheel)
+        # the images are attached to the items when the canvas is shown for the first time
+        self.wheel_item = self.canvas.create_image(self.image_dimension/2, self.image_dimension/2)
+        self.target_style = target_style
+        self.target_item = self.vector_target = None
+        if target_style == "image":
+            self.target_item = self.canvas.create_image(self.image_dimension/2, self.image_dimension/2)
+        else:
+            self.vector_target = VectorTarget(self.canvas, self.image_dimension/2, self.image_dimension/2, self.target_dimension, int(self._apply_window_scaling(2)))
         self.set_initial_color(initial_color)
         
         self.brightness_slider_value = customtkinter.IntVar()
-        self.brightness_slider_value.set(255)
+        self.brightness_slider_value.set(self.color_state.brightness)
         
         self.slider = customtkinter.CTkSlider(master=self.frame, height=20, border_width=self.slider_border,
                                               button_length=15, progress_color=self.default_hex_color, from_=0, to=255,
                                               variable=self.brightness_slider_value, number_of_steps=256,
                                               button_corner_radius=self.corner_radius, corner_radius=self.corner_radius,
                                               button_color=self.button_color, button_hover_color=self.button_hover_color,
-                                              command=lambda x:self.update_colors())
+                                              command=self.on_brightness_changed)
         self.slider.pack(fill="both", pady=(0,15), padx=20-self.slider_border)
 
         self.label = customtkinter.CTkLabel(master=self.frame, text_color="#000000", height=50, fg_color=self.default_hex_color,
                                             corner_radius=self.corner_radius, text=self.default_hex_color)
         self.label.pack(fill="both", padx=10)
         
+        self.palette = None
+        self.palette_shows_recent = palette == "recent"
+        if palette is not None:
+            self.palette = PalettePanel(master=self.frame, colors=self.recent_colors.colors if self.palette_shows_recent else palette, command=self.on_palette_selected, width=WIDTH - 80, rows=palette_rows,
+                                        fg_color=self.fg_color, corner_radius=self.corner_radius // 3)
+            self.palette.pack(pady=(10, 0), padx=10)
+        
         self.button = customtkinter.CTkButton(master=self.frame, text=self.button_text, height=50, corner_radius=self.corner_radius, fg_color=self.button_color,
                                               hover_color=self.button_hover_color, command=self._ok_event, **button_kwargs)
         self.button.pack(fill="both", padx=10, pady=20)
                 
         self.after(150, lambda: self.label.focus())
                 
-        self.grab_set()
+        if self.modal:
+            self.grab_set()
         
     def get(self):
         self._color = self.label._fg_color
-        self.master.wait_window(self)
+        if self.reusable:
+            # a reusable dialog is hidden instead of destroyed
+            if not self._future.done():
+                self.wait_variable(self._closed)
+        else:
+            self.master.wait_window(self)
         return self._color
     
+    def open(self, callback=None):
+        # non-blocking alternative to get(), no nested event loop: the future is resolved with the color on OK and with None on close
+        if callback is not None:
+            self._future.add_done_callback(lambda future: callback(future.result()))
+        return self._future
+    
+    @classmethod
+    async def ask_async(cls, **kwargs):
+        # create a dialog and wait for its color without blocking the asyncio loop driving tk (use modal=False for several dialogs at once)
+        import asyncio
+        return await asyncio.wrap_future(cls(**kwargs).open())
+    
+    @classmethod
+    def pooled(cls, initial_color=None, title="Choose Color", **kwargs):
+        # get a hidden dialog created earlier with the same options and show it again, every widget and image is reused
+        # only closed dialogs are in the pool, a new one is created while the others are still shown
+        key = repr(sorted(kwargs.items()))
+        hidden = cls._pool.setdefault(key, [])
+        while hidden:
+            dialog = hidden.pop()
+            try:
+                alive = dialog.winfo_exists()
+            except tkinter.TclError:
+                alive = False
+            if alive:
+                return dialog.show(initial_color, title)
+            
+        dialog = cls(initial_color=initial_color, title=title, reusable=True, **kwargs)
+        dialog._pool_key = key
+        return dialog
+    
+    def show(self, initial_color=None, title=None):
+        # show a hidden reusable dialog again, reset to a new initial color
+        if not self._future.done():
+            # still open: its caller gets None, as if it was closed, before the dialog starts over
+            self._color = None
+            self._resolve()
+        if self._pool_key is not None and self in self._pool.get(self._pool_key, ()):
+            self._pool[self._pool_key].remove(self) # shown directly, not through pooled()
+        if title is not None:
+            self.title(title)
+        self._color = None
+        self._future = Future()
+        
+        # the slider, the target and the label all move to the new color (white if it is missing or not valid), like a palette color
+        try:
+            self.set_color((initial_color or "#ffffff")[:7], notify=False)
+        except ValueError:
+            self.set_color("#ffffff", notify=False)
+        if self.palette_shows_recent:
+            self.palette.set_colors(self.recent_colors.colors)
+        
+        self.deiconify()
+        self.lift()
+        self.after(150, lambda: self.label.focus())
+        if self.modal:
+            self.grab_set()
+        return self
+    
     def _ok_event(self, event=None):
         self._color = self.label._fg_color
-        self.grab_release()
-        self.destroy()
-        del self.img1
-        del self.img2
-        del self.wheel
-        del self.target
+        self.recent_colors.add(self._color)
+        self._close()
         
     def _on_closing(self):
         self._color = None
+        self._close()
+        
+    def _close(self):
+        self._cancel_drag()
         self.grab_release()
-        self.destroy()
-        del self.img1
-        del self.img2
-        del self.wheel
-        del self.target
-        
-    def on_mouse_drag(self, event):
-        x = event.x
-        y = event.y
-        self.canvas.delete("all")
-        self.canvas.create_image(self.image_dimension/2, self.image_dimension/2, image=self.wheel)
-        
-        d_from_center = math.sqrt(((self.image_dimension/2)-x)**2 + ((self.image_dimension/2)-y)**2)
-        
-        if d_from_center < self.image_dimension/2:
-            self.target_x, self.target_y = x, y
+        if self.reusable:
+            self.withdraw()
         else:
-            self.target_x, self.target_y = self.projection_on_circle(x, y, self.image_dimension/2, self.image_dimension/2, self.image_dimension/2 -1)
-
-        self.canvas.create_image(self.target_x, self.target_y, image=self.target)
+            self.destroy()
+            del self.color_wheel_image
+            del self.target_image
+            del self.wheel
+            del self.target
+        # back in the pool before the callbacks run, so one calling show() on this dialog takes it out again
+        if self.reusable and self._pool_key is not None:
+            hidden = self._pool.setdefault(self._pool_key, [])
+            if self not in hidden:
+                hidden.append(self)
+        self._resolve()
         
-        self.get_target_color()
-        self.update_colors()
-  
-    def get_target_color(self):
-        try:
-            self.rgb_color = self.img1.getpixel((self.target_x, self.target_y))
-            
-            r = self.rgb_color[0]
-            g = self.rgb_color[1]
-            b = self.rgb_color[2]    
-            self.rgb_color = [r, g, b]
-            
-        except AttributeError:
-            self.rgb_color = self.default_rgb
-    
-    def update_colors(self):
-        brightness = self.brightness_slider_value.get()
-
-        self.get_target_color()
-
-        r = int(self.rgb_color[0] * (brightness/255))
-        g = int(self.rgb_color[1] * (brightness/255))
-        b = int(self.rgb_color[2] * (brightness/255))
+    def _resolve(self):
+        if not self._future.done():
+            self._future.set_result(self._color)
+        self._closed.set(True)
         
-        self.rgb_color = [r, g, b]
-
-        self.default_hex_color = "#{:02x}{:02x}{:02x}".format(*self.rgb_color)
+    # the picked color lives in the state
+    @property
+    def default_hex_color(self):
+        return self.color_state.hex_color
+    
+    @default_hex_color.setter
+    def default_hex_color(self, value):
+        self.color_state.hex_color = value
         
+    def on_palette_selected(self, color):
+        self.set_color(color)
+  
+    def show_color(self, notify=True):
+        # the dialog has no command, notify is accepted for the shared view code
+        if self.instrumentation:
+            start = self.instrumentation.now()
         self.slider.configure(progress_color=self.default_hex_color)
-        self.label.configure(fg_color=self.default_hex_color)
-        
-        self.label.configure(text=str(self.default_hex_color))
-        
-        if self.brightness_slider_value.get() < 70:
-            self.label.configure(text_color="white")
-        else:
-            self.label.configure(text_color="black")
-            
-        if str(self.label._fg_color)=="black":
-            self.label.configure(text_color="white")
+        self.label.configure(fg_color=self.default_hex_color, text=str(self.default_hex_color), text_color=self.color_state.text_color())
+        if self.vector_target is not None:
+            self.vector_target.recolor(self.color_state.text_color())
+        if self.instrumentation:
+            self.instrumentation.record("reconfigure", start)
             
-    def projection_on_circle(self, point_x, point_y, circle_x, circle_y, radius):
-        angle = math.atan2(point_y - circle_y, point_x - circle_x)
-        projection_x = circle_x + radius * math.cos(angle)
-        projection_y = circle_y + radius * math.sin(angle)
-
-        return projection_x, projection_y
-    
     def set_initial_color(self, initial_color):
-        # set_initial_color is in beta stage, cannot seek all colors accurately
-        
         if initial_color and initial_color.startswith("#"):
             try:
-                r,g,b = tuple(int(initial_color.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
+                rgb = hex_to_rgb(initial_color[:7])
             except ValueError:
                 return
             
+            self.color_state.set_color(rgb)
             self.default_hex_color = initial_color
-            for i in range(0, self.image_dimension):
-                for j in range(0, self.image_dimension):
-                    self.rgb_color = self.img1.getpixel((i, j))
-                    if (self.rgb_color[0], self.rgb_color[1], self.rgb_color[2])==(r,g,b):
-                        self.canvas.create_image(i, j, image=self.target)
-                        self.target_x = i
-                        self.target_y = j
-                        return
-                    
-        self.canvas.create_image(self.image_dimension/2, self.image_dimension/2, image=self.target)
+            self.move_target()
         
 if __name__ == "__main__":
     app = AskColor()
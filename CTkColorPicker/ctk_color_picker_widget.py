@@ -3,12 +3,18 @@
 # Contributors: Marini Pietro (marini-pietro) TODO: search for potential optimizations
 
 from PIL import Image, ImageTk
-from math import atan2, cos, sin, sqrt
-import sys, os, customtkinter, tkinter
-
-PATH = os.path.dirname(os.path.realpath(__file__))
-
-class CTkColorPicker(customtkinter.CTkFrame):
+import sys, customtkinter, tkinter
+from .color_engine import ColorPickerState
+from .color_conversion import hex_to_rgb, rgb_to_hex, scale_brightness
+from .picker_view import ColorPickerView
+from .command_dispatcher import CommandDispatcher
+from .palette_panel import PalettePanel
+from .disk_cache import RecentColors
+from .instrumentation import Instrumentation, logger
+from .vector_target import VectorTarget
+from concurrent.futures import Executor
+
+class CTkColorPicker(ColorPickerView, customtkinter.CTkFrame):
     
     def __init__(self,
                  master: any = None,
@@ -18,10 +24,27 @@ class CTkColorPicker(customtkinter.CTkFrame):
                  slider_border: int = 1,
                  corner_radius: int = 24,
                  command = None,
+                 command_on_change: bool = False,
+                 command_policy: str = "immediate",
+                 command_delay: int = 0,
+                 command_executor: Executor = None,
+                 command_result = None,
                  orientation = "vertical",
                  rgb_entries: bool = False,
+                 update_mode: str = "immediate",
+                 max_fps: int = 60,
+                 live_brightness: bool = False,
+                 palette: list[str] = None,
+                 palette_rows: int = 2,
+                 cache_dir: str = None,
+                 instrumentation: Instrumentation = None,
+                 responsive: bool = False,
+                 resize_delay: int = 150,
+                 target_style: str = "image",
+                 color_space: str = "rgb",
                  **slider_kwargs) -> None:
     
+        self._check_options(update_mode, target_style, color_space) # raises ValueError before the frame is created
         super().__init__(master=master, corner_radius=corner_radius)
         
         WIDTH: int = width if width>=200 else 200 # width cannot be less than 200
@@ -32,47 +55,78 @@ class CTkColorPicker(customtkinter.CTkFrame):
         self.lift() # lift the widget to the top
 
         self.after(10)       
-        self.hex_color: str = initial_hex_color # Set hex color string to parameter
-        self.default_rgb: list[int] = [255, 255, 255] # default color is white
-        self.rgb_color: list[int] = self.default_rgb[:] # default color is white (slicing is used to create a deep copy of list)
+        self.color_state: ColorPickerState = ColorPickerState(self.image_dimension, color_space=color_space) # position, brightness and color of the picker (the widget is a view over it)
+        self.color_space: str = color_space # "rgb" shows the hsv wheel, "oklch" the perceptual wheel whose lightness is set by the slider
+        self.hex_color = initial_hex_color # Set hex color string to parameter
         
         self.corner_radius: int = corner_radius # corner radius of the slider
         self.command = command # command to execute when the color is changed
+        self.instrumentation: Instrumentation = instrumentation # opt-in stage timings and event counters (None disables them)
+        self.command_dispatcher: CommandDispatcher = CommandDispatcher(self, command, on_change=command_on_change, policy=command_policy, delay=command_delay,
+                                                                       executor=command_executor, result_callback=command_result,
+                                                                       instrumentation=instrumentation) # decides when and where the command runs
         self.slider_border: int = 10 if slider_border>=10 else slider_border # slider border cannot be less than 10
+
+        self._init_updates(update_mode, max_fps) # drag events handling ("immediate" handles every event, "latest" only the most recent one once per frame)
+
+        # resizing ("responsive" pickers follow the size given by their container, the wheel is only rendered again once the size settles)
+        self.responsive: bool = responsive
+        self.resize_delay: int = resize_delay # milliseconds without <Configure> events before the wheel is resized
+        self._resize_job: str = None # id of the scheduled resize
+        if responsive: tkinter.Frame.bind(self, "<Configure>", self.on_configure, add="+") # the frame itself, CTkFrame.bind would bind its inner canvas
         
         # set the foreground color of the slider
         self.fg_color: str = self._apply_appearance_mode(self._fg_color) if fg_color is None else fg_color
         self.configure(fg_color=self.fg_color) # set the foreground color
           
         # create the canvas
-        self.canvas: tkinter.Canvas = tkinter.Canvas(self, height=self.image_dimension, width=self.image_dimension, highlightthickness=0, bg=self.fg_color)
+        self.canvas: tkinter.Canvas = tkinter.Canvas(self, height=self.image_dimension, width=self.image_dimension, highlightthickness=0, bg=self.fg_color, takefocus=1)
+        self.canvas.bind("<Button-1>", self.on_mouse_press) # a click picks the color under the pointer
         self.canvas.bind("<B1-Motion>", self.on_mouse_drag) # bind the mouse drag event to the canvas
-
-        # load the images
-        self.color_wheel_image: Image = Image.open(os.path.join(PATH, 'color_wheel.png')).resize((self.image_dimension, self.image_dimension), Image.Resampling.LANCZOS)
-        self.target_image: Image = Image.open(os.path.join(PATH, 'target.png')).resize((self.target_dimension, self.target_dimension), Image.Resampling.LANCZOS)
-
-        # convert the images to tkinter images
-        self.wheel: ImageTk.PhotoImage = ImageTk.PhotoImage(self.color_wheel_image)
-        self.target: ImageTk.PhotoImage = ImageTk.PhotoImage(self.target_image)
-
-        # draw the images on the canvas
-        self.canvas.create_image(self.image_dimension/2, self.image_dimension/2, image=self.wheel) # draw the wheel
+        self.canvas.bind("<KeyPress>", self.on_key_nudge) # arrows nudge the hue and the saturation, page up/down and +/- the brightness
+        for sequence in ("<MouseWheel>", "<Shift-MouseWheel>", "<Button-4>", "<Button-5>", "<Shift-Button-4>", "<Shift-Button-5>"):
+            self.canvas.bind(sequence, self.on_mouse_wheel) # the wheel nudges the brightness, the hue with shift
+        self.canvas.bind("<Map>", self.load_images) # the images are only built when the canvas is shown for the first time
+        self.canvas.bind("<ButtonRelease-1>", self.on_mouse_release) # a color is picked when the button is released
+
+        self.cache_dir: str = cache_dir # directory the images and the recent colors are persisted in (None to keep them in memory only)
+        self.recent_colors: RecentColors = RecentColors(cache_dir) # most recently picked colors
+
+        self.image_scaling: float = self._get_widget_scaling() # scaling factor the images are built with
+        self.live_brightness: bool = live_brightness or color_space == "oklch" # show the wheel at the brightness of the slider (the perceptual wheel always follows it)
+        self.shown_brightness: int = 255 # brightness the wheel image is currently shown at
+        self.color_wheel_image: Image = None # set by load_images
+        self.target_image: Image = None
+        self.wheel: ImageTk.PhotoImage = None
+        self.target: ImageTk.PhotoImage = None
+
+        # create the canvas items (the images are attached by load_images, the items are kept and only moved afterwards)
+        self.target_style: str = target_style # "image" shows target.png, "vector" draws the target with canvas ovals
+        self.wheel_item: int = self.canvas.create_image(self.image_dimension/2, self.image_dimension/2) # the wheel
+        self.target_item: int = None
+        self.vector_target: VectorTarget = None
+        if target_style == "image": self.target_item = self.canvas.create_image(self.image_dimension/2, self.image_dimension/2) # the target
+        else: self.vector_target = VectorTarget(self.canvas, self.image_dimension/2, self.image_dimension/2, self.target_dimension, int(self._apply_widget_scaling(2)))
         self.set_initial_color(initial_hex_color) # set the initial color of the widget on the color wheel
         
         # create the slider
         self.brightness_slider_value: customtkinter.IntVar = customtkinter.IntVar() 
-        self.brightness_slider_value.set(255) # set value of brightness slider to 255
+        self.brightness_slider_value.set(self.color_state.brightness) # 255, or the lightness of the initial color on the perceptual wheel
         
         self.slider: customtkinter.CTkSlider = customtkinter.CTkSlider(master=self, width=20, border_width=self.slider_border,
                                               button_length=15, progress_color=self.hex_color, from_=0, to=255,
                                               variable=self.brightness_slider_value, number_of_steps=256,
                                               button_corner_radius=self.corner_radius, corner_radius=self.corner_radius,
-                                              command=lambda x:self.update_colors(), orientation=orientation, **slider_kwargs)
+                                              command=self.on_brightness_changed, orientation=orientation, **slider_kwargs)
         
+        # persistent tk variables of the entries (values are updated in place instead of creating new variables)
+        self.hex_variable: tkinter.StringVar = tkinter.StringVar(master=self, value=self.hex_color)
+        self.rgb_variables: list[tkinter.StringVar] = [tkinter.StringVar(master=self, value=str(self.rgb_color[i])) for i in range(3)]
+        self._applied_options: dict[str, dict] = {} # last options passed to configure for each widget (see _configure_changed)
+
         # create the entry widget
         self.entry: customtkinter.CTkEntry = customtkinter.CTkEntry(master=self, text_color="#000000", width=10, fg_color=self.hex_color,
-                            corner_radius=self.corner_radius, textvariable=tkinter.StringVar(value=self.hex_color))
+                            corner_radius=self.corner_radius, textvariable=self.hex_variable)
         self.entry.bind("<KeyRelease>", self.on_key_released) # bind key release event to the label
         self.entry.configure(validate='key', validatecommand=(master.register(self.validate_hex_entry), '%P')) # add the validation command to the entry
 
@@ -84,7 +138,7 @@ class CTkColorPicker(customtkinter.CTkFrame):
             channel_letters: list[str] = ["R", "G", "B"] # channel letters
             self.rgb_labels: list[customtkinter.CTkLabel] = [customtkinter.CTkLabel(master=self.couple_frames[channel_letters.index(channel_letter)], text_color=colors, text=channel_letter, corner_radius=self.corner_radius) for channel_letter in channel_letters] # create 3 label widgets for rgb values
             self.rgb_entries: list[customtkinter.CTkEntry] = [customtkinter.CTkEntry(master=self.couple_frames[i], text_color=colors, width=50, corner_radius=self.corner_radius,
-                                                              textvariable=tkinter.StringVar(value=str(self.rgb_color[i]))) for i in range(3)] # create 3 entry widgets for rgb values
+                                                              textvariable=self.rgb_variables[i]) for i in range(3)] # create 3 entry widgets for rgb values
             self.rgb_frame.pack(side="bottom", pady=10, padx=10) # pack the frame
 
             for i in range(3): # loop through the rgb labels and entries
@@ -96,6 +150,14 @@ class CTkColorPicker(customtkinter.CTkFrame):
 
                 self.couple_frames[i].pack(side="left", pady=(0, 5))
 
+        # create the palette panel if required (swatches are drawn on a single canvas, only the visible rows exist)
+        self.palette: PalettePanel = None
+        self.palette_shows_recent: bool = palette == "recent" # the palette shows the recent colors and follows them
+        if palette is not None:
+            self.palette = PalettePanel(master=self, colors=self.recent_colors.colors if self.palette_shows_recent else palette, command=self.on_palette_selected, width=WIDTH - 40, rows=palette_rows,
+                                        fg_color=self.fg_color, corner_radius=self.corner_radius // 3)
+            self.palette.pack(side="bottom", pady=(0, 10), padx=10)
+
         # pack the widgets based on orientation
         if orientation=="vertical":
             self.canvas.pack(pady=20, side="left", padx=(10,0))
@@ -147,26 +209,24 @@ class CTkColorPicker(customtkinter.CTkFrame):
 
         if len(self.hex_color) < 7: # if the length of the hex color is not 7 (6 numbers and #)
             self.hex_color = "not valid"
-            self.entry.configure(fg_color="#ffffff")
-            self.slider.configure(state="disabled") # disable the slider
-            self.slider.configure(progress_color="#ffffff") # update the progress color of the slider
+            self._configure_changed(self.entry, fg_color="#ffffff")
+            self._configure_changed(self.slider, state="disabled", progress_color="#ffffff") # disable the slider and update its progress color
+        elif self.color_space == "oklch": # the lightness is part of the color: the slider and the wheel move to it, like a palette color
+            self.set_color(self.hex_color, notify=False)
+            return
         else:
             brightness = self.brightness_slider_value.get() # get the brightness value
-            self.rgb_color: list[int] = [int(int(self.hex_color[1:3], 16) * (brightness / 255)), 
-                                         int(int(self.hex_color[3:5], 16) * (brightness / 255)), 
-                                         int(int(self.hex_color[5:7], 16) * (brightness / 255))] # update the rgb color
+            self.rgb_color: list[int] = scale_brightness(hex_to_rgb(self.hex_color), brightness) # update the rgb color
             
-            self.hex_color = "#{:02x}{:02x}{:02x}".format(*self.rgb_color) # update the hex color based on the rgb color
+            self.hex_color = rgb_to_hex(self.rgb_color) # update the hex color based on the rgb color
 
-            self.slider.configure(progress_color=self.hex_color) # update the progress color of the slider
-            self.slider.configure(state="normal") # enable the slider
+            self._configure_changed(self.slider, state="normal", progress_color=self.hex_color) # enable the slider and update its progress color
 
             # update the text color of the label
-            self.entry.configure(fg_color=self.hex_color)
+            self._configure_changed(self.entry, fg_color=self.hex_color)
+            self.update_pointer_position_on_wheel() # a complete color, whatever its last character (a to f too)
 
         self.update_rgb_entries() # update the rgb entries
-        if event.keysym.isdigit(): # if the key is a digit (not backspace or delete because hex code always need 6 characters) TODO: modify the code so the function is not called if the user tries to add an eighth character
-            self.update_pointer_position_on_wheel() # update the pointer position on the wheel
 
     def on_rgb_key_released(self, event) -> None:
         """
@@ -180,21 +240,21 @@ class CTkColorPicker(customtkinter.CTkFrame):
             None
         """
 
-        for i, entry in enumerate(self.rgb_entries):
-            value = entry.get().lstrip('0') or '0'  # get the value of the entry and remove leading zeros
+        for i, variable in enumerate(self.rgb_variables):
+            value = variable.get().lstrip('0') or '0'  # get the value of the entry and remove leading zeros
             self.rgb_color[i] = int(value)  # update the rgb_color list
-            entry.configure(textvariable=tkinter.StringVar(value=value))  # update the text variable of the entry
+            self._set_if_changed(variable, value)  # update the text of the entry
             
-        # Gather the rgb values from the entries
-        self.rgb_color = [int(entry.get()) for entry in self.rgb_entries]
-
         #Update the hex color
-        self.hex_color = "#{:02x}{:02x}{:02x}".format(*self.rgb_color)
+        self.hex_color = rgb_to_hex(self.rgb_color)
+        if self.color_space == "oklch": # the slider and the wheel move to the lightness of the color
+            self.set_color(self.hex_color, notify=False)
+            return
 
-        self.entry.configure(textvariable=tkinter.StringVar(value=self.hex_color)) #Update the text of the entry
-        self.entry.configure(fg_color=self.hex_color) # update the text color of the label
+        self._set_if_changed(self.hex_variable, self.hex_color) #Update the text of the entry
+        self._configure_changed(self.entry, fg_color=self.hex_color) # update the text color of the label
 
-        self.slider.configure(progress_color=self.hex_color) # update the progress color of the slider
+        self._configure_changed(self.slider, progress_color=self.hex_color) # update the progress color of the slider
 
         if event.keysym.isdigit() or event.keysym in ('BackSpace', 'Delete'): # if the key is a digit or backspace or delete
             self.update_pointer_position_on_wheel() # update the pointer position on the wheel
@@ -211,13 +271,54 @@ class CTkColorPicker(customtkinter.CTkFrame):
             None
         """
         
-        # update the text of the rgb entries
-        if self.are_rgb_entries_present: [self.rgb_entries[i].configure(textvariable=tkinter.StringVar(value=str(self.rgb_color[i]))) for i in range(3)] # update the text of the rgb entries (only if they are present) 
+        # update the text of the rgb entries (only if they are present)
+        if self.are_rgb_entries_present:
+            for i in range(3): self._set_if_changed(self.rgb_variables[i], str(self.rgb_color[i]))
 
-    def on_mouse_drag(self, event) -> None:
+    def _set_if_changed(self, variable: tkinter.Variable, value) -> None:
         """
-        Get the color of the target pixel and update the colors.
-        
+        Set the value of a tk variable, skipping the call (and the traces it triggers) if it already holds that value.
+
+        params:
+            variable: tkinter.Variable The variable.
+            value: any The new value.
+        raises:
+            None
+        returns:
+            None
+        """
+        if variable.get() != value: variable.set(value)
+
+    def _configure_changed(self, widget, **options) -> None:
+        """
+        Configure a widget with the options whose value changed since the last call, in a single configure call.
+        Nothing is done if every option already has the requested value.
+
+        params:
+            widget: customtkinter.CTkBaseClass The widget to configure.
+            **options: The options to apply.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        applied = self._applied_options.setdefault(str(widget), {})
+        changed = {option: value for option, value in options.items() if applied.get(option) != value}
+        if changed:
+            applied.update(changed)
+            widget.configure(**changed)
+
+    # the picked color lives in the state, this property keeps the widget attribute working (the others are in ColorPickerView)
+    @property
+    def hex_color(self) -> str: return self.color_state.hex_color
+    @hex_color.setter
+    def hex_color(self, value: str) -> None: self.color_state.hex_color = value
+
+    def on_mouse_release(self, event) -> None:
+        """
+        Record the picked color in the recent colors when the mouse button is released on the wheel.
+
         params:
             event: tkinter.Event The event object.
         raises:
@@ -226,26 +327,14 @@ class CTkColorPicker(customtkinter.CTkFrame):
             None
         """
 
-        self.canvas.delete("all") # clear the canvas
-        self.canvas.create_image(self.image_dimension/2, self.image_dimension/2, image=self.wheel) # redraw the wheel
-        
-        x, y = event.x, event.y # get the x and y coordinates of the mouse
-        d_from_center = sqrt(((self.image_dimension/2)-x)**2 + ((self.image_dimension/2)-y)**2) # distance from center
-        
-        if d_from_center < self.image_dimension // 2: # if the distance from the center is less than the radius of the wheel
-            self.target_x, self.target_y = x, y # set the target coordinates
-        else: # if the distance from the center is greater than the radius of the wheel (still track mouse movement if outside the wheel)
-            self.target_x, self.target_y = self.projection_on_circle(x, y, self.image_dimension/2, self.image_dimension/2, self.image_dimension/2 -1)
+        if self._drag_job is not None: # handle the last pointer position before recording the color
+            self.after_cancel(self._drag_job)
+            self._flush_drag()
+        self.remember_color()
 
-        self.canvas.create_image(self.target_x, self.target_y, image=self.target) # draw the target
-        
-        self.get_target_color() # get the color of the target pixel
-        self.update_colors() # update the colors
-        self.update_rgb_entries() # update the rgb entries
-    
-    def update_colors(self) -> None:
+    def remember_color(self) -> None:
         """
-        Update the colors of the slider and the label.
+        Add the current color to the recent colors (saved in the cache directory, shown by a "recent" palette).
 
         params:
             None
@@ -255,60 +344,111 @@ class CTkColorPicker(customtkinter.CTkFrame):
             None
         """
 
-        brightness = self.brightness_slider_value.get() # get the brightness value
+        if self.recent_colors.add(self.get()) and self.palette_shows_recent: self.palette.set_colors(self.recent_colors.colors)
 
-        self.get_target_color() # get the color of the target pixel
+    def on_configure(self, event) -> None:
+        """
+        Schedule a resize of the wheel when the widget is resized (debounced, only the final size is rendered).
+
+        params:
+            event: tkinter.Event The <Configure> event object.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        if self._resize_job is not None: self.after_cancel(self._resize_job)
+        self._resize_job = self.after(self.resize_delay, self.fit_wheel)
+
+    def fit_wheel(self) -> None:
+        """
+        Resize the wheel to the space the container gives the widget.
+        The extra (or missing) space compared to the requested size of the widget goes to the wheel, so the layout reaches a fixed point.
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            None
+        """
+
+        self._resize_job = None
+        extra = min(self.winfo_width() - self.winfo_reqwidth(), self.winfo_height() - self.winfo_reqheight())
+        self.resize_wheel(self.image_dimension + extra)
+
+    def resize_wheel(self, dimension: int) -> None:
+        """
+        Show the wheel at a new size.
+        The wheel of that size comes from the image cache (rendered once from the hsv model, never resampled) and the target keeps its hue and saturation.
+
+        params:
+            dimension: int The new size of the wheel in pixels (already scaled, at least 100 scaled pixels).
+        raises:
+            None
+        returns:
+            None
+        """
+
+        dimension = max(int(dimension), int(self._apply_widget_scaling(100)))
+        if dimension == self.image_dimension: return
+
+        self.image_dimension = dimension
+        self.color_state.resize(dimension)
+        self.canvas.configure(width=dimension, height=dimension)
+        self.canvas.coords(self.wheel_item, dimension / 2, dimension / 2)
+        self.move_target()
+
+        if self.wheel is not None: # reload the images at the new size if they were already shown
+            self.wheel = None
+            self.shown_brightness = 255
+            self.load_images()
+
+    def show_color(self, notify: bool = True) -> None:
+        """
+        Show the color of the state on the rgb entries, the slider and the label, then notify the command.
+
+        params:
+            notify: bool Give the color to the command.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        instrumentation = self.instrumentation
+        if instrumentation: start = instrumentation.now()
 
-        self.rgb_color = [int(self.rgb_color[0] * (brightness/255)), 
-                          int(self.rgb_color[1] * (brightness/255)),
-                          int(self.rgb_color[2] * (brightness/255))] # update the rgb color
-        
         #update the rgb entries
         self.update_rgb_entries()
 
-        self.hex_color = "#{:02x}{:02x}{:02x}".format(*self.rgb_color) # update the hex color
-        
-        self.slider.configure(progress_color=self.hex_color) # update the progress color of the slider
-        self.entry.configure(fg_color=self.hex_color)  # update the text color of the label
-        
-        label_text = tkinter.StringVar(value=self.hex_color)
-        self.entry.configure(textvariable=label_text) # update the text of the label
+        self._configure_changed(self.slider, state="normal", progress_color=self.hex_color) # a valid color is shown, enable the slider (disabled by an incomplete hex) and update its progress color
+        self._set_if_changed(self.hex_variable, self.hex_color) # update the text of the label
         
         # change text color based on brightness
-        if self.brightness_slider_value.get() < 70: self.entry.configure(text_color="white")
-        else: self.entry.configure(text_color="black")
-            
-        if str(self.entry._fg_color)=="black": self.entry.configure(text_color="white")
+        self._configure_changed(self.entry, fg_color=self.hex_color, text_color=self.color_state.text_color()) # update the colors of the label in one call
+        if self.vector_target is not None: self.vector_target.recolor(self.color_state.text_color()) # contrasting rings, only reconfigured when the contrast flips
+        if instrumentation: instrumentation.record("reconfigure", start)
 
-        if self.command: self.command(self.get())
+        if notify and self.command: self.command_dispatcher.notify(self.get())
 
-    def get_target_color(self) -> None:
+    def on_palette_selected(self, color: str) -> None:
         """
-        Get the color of the target pixel.
-        
+        Jump to a color of the palette.
+
         params:
-            None
+            color: str The hex color of the clicked swatch.
         raises:
-            AttributeError if the target pixel is out of bounds
+            None
         returns:
             None
         """
-
-        try:
-            self.rgb_color = self.color_wheel_image.getpixel((self.target_x, self.target_y))
-            
-            r = self.rgb_color[0]
-            g = self.rgb_color[1]
-            b = self.rgb_color[2]    
-            self.rgb_color = [r, g, b]
-            
-        except AttributeError:
-            self.rgb_color = self.default_rgb
+        self.set_color(color)
 
     def set_initial_color(self, initial_color):
         """
         Set the initial color of the widget on the color wheel.
-        Still in beta stage cannot find all colors accurately.
 
         params:
             initial_color: str The initial color of the widget.
@@ -318,10 +458,9 @@ class CTkColorPicker(customtkinter.CTkFrame):
             None
         """
         
-        self.rgb_color = [int(initial_color[1:3], 16), int(initial_color[3:5], 16), int(initial_color[5:7], 16)] # get the rgb color from the hex color
-        self.target_x, self.target_y = self.find_color_coords(self.rgb_color) # find the coordinates of the color on the color wheel
+        self.color_state.set_color(hex_to_rgb(initial_color)) # store the color and find its coordinates on the color wheel
                     
-        self.canvas.create_image(self.target_x, self.target_y, image=self.target) # draw the target
+        self.move_target() # move the target
 
     def update_pointer_position_on_wheel(self) -> None:
         """
@@ -337,14 +476,12 @@ class CTkColorPicker(customtkinter.CTkFrame):
         
         # Find the coordinates of the color on the color wheel
         self.target_x, self.target_y = self.find_color_coords(self.rgb_color)
-        print(f" - updating pointer position on wheel to {self.target_x, self.target_y}")
+        logger.debug("pointer moved to (%.1f, %.1f)", self.target_x, self.target_y)
 
         # Update the position of the pointer
-        self.canvas.delete("all")
-        self.canvas.create_image(self.image_dimension / 2, self.image_dimension / 2, image=self.wheel)
-        self.canvas.create_image(self.target_x, self.target_y, image=self.target)
+        self.move_target()
 
-    def find_color_coords(self, color) -> tuple[int, int]:
+    def find_color_coords(self, color) -> tuple[float, float]:
         """
         Find the coordinates of a color on the color wheel.
 
@@ -353,43 +490,16 @@ class CTkColorPicker(customtkinter.CTkFrame):
         raises:
             None
         returns:
-            tuple[int, int] The x and y coordinates of the color. 
-            tuple[int, int] The middle of the image if the color is not found.
-        """
-        width = height = self.image_dimension
-        
-        for i in range(width):
-            for j in range(height):
-                r, g, b = self.color_wheel_image.getpixel((i, j))[:-1]
-                if (color[0], color[1], color[2]) == (r, g, b):
-                    print(f"Found color at {i, j}", end=" ")
-                    return i, j
-                
-        print("Color not found defaulting to center of the image", end=" ")
-        return width//2, height//2
-        
-    def projection_on_circle(self, point_x, point_y, circle_x, circle_y, radius) -> tuple[int, int]:
+            tuple[float, float] The x and y coordinates of the color (its brightness is ignored, the slider handles it).
         """
-        Get the projection of a point on a circle.
-        Used to figure out the closest point on the circle to the given point to place the target on the color wheel even if the user presses outside of it.
+        instrumentation = self.instrumentation
+        if instrumentation: start = instrumentation.now()
 
-        params:
-            point_x: int The x-coordinate of the point.
-            point_y: int The y-coordinate of the point.
-            circle_x: int The x-coordinate of the center of the circle.
-            circle_y: int The y-coordinate of the center of the circle.
-            radius: int The radius of the circle.
-        raises:
-            None
-        returns:
-            tuple[int, int] The x and y coordinates of the projection.
-        """
-        angle = atan2(point_y - circle_y, point_x - circle_x)
-        projection_x = circle_x + radius * cos(angle)
-        projection_y = circle_y + radius * sin(angle)
+        i, j = self.color_state.find_coords(color) # closed form inverse of the wheel model
 
-        return projection_x, projection_y
-    
+        if instrumentation: instrumentation.record("lookup", start)
+        return i, j
+        
     def get(self):
         """
         Get the color of the widget.
@@ -410,6 +520,9 @@ class CTkColorPicker(customtkinter.CTkFrame):
             None
         """
 
+        self._cancel_drag() # drop the pending coalesced drag and nudge updates
+        if self._resize_job is not None: self.after_cancel(self._resize_job) # drop the pending resize
+        self.command_dispatcher.cancel() # drop the pending command calls
         super().destroy()
         del self.color_wheel_image
         del self.target_image
@@ -0,0 +1,233 @@
+# Optional on-disk cache of the CTk Color Picker
+# Keeps the rendered images per size as raw RGBA files that later processes memory-map instead of rendering or resizing again,
+# and a bounded most recently used list of the picked colors.
+# Every image file starts with a header holding a key of the package version and the asset, files with another key are rebuilt.
+
+from collections import OrderedDict
+import functools, hashlib, json, mmap, os, struct
+
+MAGIC: bytes = b"CTKC" # first bytes of every image file
+FORMAT_VERSION: int = 1 # version of the file layout, bump it when the header or the data change
+HEADER: struct.Struct = struct.Struct("<4sHII16s") # magic, format version, width, height, key digest
+RECENT_COLORS_FILE: str = "recent_colors.json"
+
+PATH = os.path.dirname(os.path.realpath(__file__))
+
+def default_cache_dir() -> str:
+    """
+    Get the default cache directory ($XDG_CACHE_HOME/CTkColorPicker, ~/.cache/CTkColorPicker when it is not set).
+
+    params:
+        None
+    raises:
+        None
+    returns:
+        str The path of the directory (it may not exist yet).
+    """
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "CTkColorPicker")
+
+@functools.lru_cache(maxsize=None)
+def asset_key(asset: str) -> bytes:
+    """
+    Get the key cached files of an asset are valid for.
+    It changes with the package version and, for assets read from a file, with the content of that file.
+
+    params:
+        asset: str "wheel" or "target".
+    raises:
+        None
+    returns:
+        bytes The 16 bytes digest.
+    """
+
+    from . import __version__
+    digest = hashlib.blake2b(f"{asset}:{__version__}:{FORMAT_VERSION}".encode(), digest_size=16)
+    if asset == "target":
+        with open(os.path.join(PATH, "target.png"), "rb") as file: digest.update(file.read())
+    return digest.digest()
+
+def image_path(cache_dir: str, asset: str, dimension: int) -> str:
+    """
+    Get the path of the cached image of an asset.
+
+    params:
+        cache_dir: str The cache directory.
+        asset: str "wheel" or "target".
+        dimension: int The size of the image.
+    raises:
+        None
+    returns:
+        str The path of the file.
+    """
+    return os.path.join(cache_dir, f"{asset}-{dimension}.rgba")
+
+def load_image(cache_dir: str, asset: str, dimension: int) -> "PIL.Image.Image":
+    """
+    Memory-map the cached image of an asset.
+    The image shares the pages of the file (read-only), nothing is decoded or copied.
+
+    params:
+        cache_dir: str The cache directory.
+        asset: str "wheel" or "target".
+        dimension: int The size of the image.
+    raises:
+        None
+    returns:
+        PIL.Image The image, None if it is not cached, stale or unreadable.
+    """
+
+    from PIL import Image
+
+    try:
+        with open(image_path(cache_dir, asset, dimension), "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError): # missing or empty file
+        return None
+
+    if len(mapping) != HEADER.size + dimension * dimension * 4 or HEADER.unpack_from(mapping) != (MAGIC, FORMAT_VERSION, dimension, dimension, asset_key(asset)):
+        mapping.close()
+        return None
+    return Image.frombuffer("RGBA", (dimension, dimension), memoryview(mapping)[HEADER.size:], "raw", "RGBA", 0, 1)
+
+def save_image(cache_dir: str, asset: str, image: "PIL.Image.Image") -> None:
+    """
+    Store the image of an asset in the cache.
+    The file is written next to its final path and renamed, so other processes never map a partial file.
+    The cache is optional: write errors are ignored.
+
+    params:
+        cache_dir: str The cache directory.
+        asset: str "wheel" or "target".
+        image: PIL.Image The square image.
+    raises:
+        None
+    returns:
+        None
+    """
+
+    width, height = image.size
+    path = image_path(cache_dir, asset, width)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(temporary, "wb") as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, width, height, asset_key(asset)))
+            file.write(image.convert("RGBA").tobytes())
+        os.replace(temporary, path)
+    except OSError:
+        try: os.remove(temporary)
+        except OSError: pass
+
+def get_image(cache_dir: str, asset: str, dimension: int, factory) -> "PIL.Image.Image":
+    """
+    Get the image of an asset from the cache, building and storing it with the factory on a miss.
+
+    params:
+        cache_dir: str The cache directory.
+        asset: str "wheel" or "target".
+        dimension: int The size of the image.
+        factory: callable Function without arguments building the image.
+    raises:
+        None
+    returns:
+        PIL.Image The image (must not be modified).
+    """
+
+    image = load_image(cache_dir, asset, dimension)
+    if image is None:
+        image = factory()
+        save_image(cache_dir, asset, image)
+    return image
+
+class RecentColors:
+    """
+    Bounded list of the most recently picked colors, saved in the cache directory.
+    Picking a color again moves it to the front instead of adding a duplicate.
+    Several lists (pickers, dialogs, processes) can share a directory: the saved list is read again and merged before every change.
+    """
+
+    def __init__(self, cache_dir: str = None, maxsize: int = 32) -> None:
+        """
+        Load the list saved in the cache directory.
+
+        params:
+            cache_dir: str The cache directory (None keeps the list in memory only).
+            maxsize: int The number of colors kept.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        self.cache_dir: str = cache_dir
+        self.maxsize: int = maxsize
+        self._colors: OrderedDict = OrderedDict() # color -> None, most recent first
+        self._colors.update((color, None) for color in self._load())
+
+    def _load(self) -> list[str]:
+        """
+        Read the list saved in the cache directory (empty if there is none or it is unreadable).
+        """
+
+        if self.cache_dir is None: return []
+        try:
+            with open(os.path.join(self.cache_dir, RECENT_COLORS_FILE)) as file: colors = json.load(file)
+        except (OSError, ValueError): # not saved yet or corrupted
+            return []
+        if not isinstance(colors, list): return []
+        return [color for color in colors[:self.maxsize] if isinstance(color, str)]
+
+    @property
+    def colors(self) -> list[str]:
+        """
+        The colors, most recent first.
+        """
+        return list(self._colors)
+
+    def add(self, color: str) -> bool:
+        """
+        Record a picked color and save the list.
+        The colors saved by other lists of the same directory since the last change are kept (they come first, this list's unsaved ones after).
+
+        params:
+            color: str The hex color.
+        raises:
+            None
+        returns:
+            bool True if the list changed.
+        """
+
+        if not color: return False
+        before = self.colors
+        saved = self._load()
+        if saved: # merge the colors picked by the other lists sharing the directory
+            merged = OrderedDict((saved_color, None) for saved_color in saved)
+            merged.update((known, None) for known in self._colors if known not in merged)
+            self._colors = merged
+        if next(iter(self._colors), None) == color: return self.colors != before # already the most recent one
+        self._colors[color] = None
+        self._colors.move_to_end(color, last=False)
+        while len(self._colors) > self.maxsize: self._colors.popitem() # drop the oldest colors
+        self.save()
+        return True
+
+    def clear(self) -> None:
+        """
+        Forget every color.
+        """
+        self._colors.clear()
+        self.save()
+
+    def save(self) -> None:
+        """
+        Write the list in the cache directory (write errors are ignored).
+        """
+
+        if self.cache_dir is None: return
+        path = os.path.join(self.cache_dir, RECENT_COLORS_FILE)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(f"{path}.{os.getpid()}.tmp", "w") as file: json.dump(self.colors, file)
+            os.replace(f"{path}.{os.getpid()}.tmp", path)
+        except OSError:
+            pass
@@ -0,0 +1,155 @@
+# Process wide cache of the images used by the CTk Color Picker widgets
+# Pickers of the same size share the same decoded images and tkinter images instead of building their own.
+# With a cache directory the images also outlive the process (see disk_cache).
+
+from PIL import Image, ImageTk
+from collections import OrderedDict
+import os
+from .wheel_model import render_wheel
+from . import disk_cache, oklch_model
+
+PATH = os.path.dirname(os.path.realpath(__file__))
+
+class LRUCache:
+    """
+    Small least recently used cache.
+    When it is full, the entry that was not used for the longest time is dropped.
+    """
+
+    def __init__(self, maxsize: int = 32) -> None:
+        self.maxsize: int = maxsize
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key, factory):
+        """
+        Get the value stored for a key, creating it with the factory on a miss.
+
+        params:
+            key: any Hashable key of the entry.
+            factory: callable Function without arguments creating the value.
+        raises:
+            None
+        returns:
+            any The cached value.
+        """
+
+        try:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        except KeyError:
+            value = self._entries[key] = factory()
+            if len(self._entries) > self.maxsize: self._entries.popitem(last=False) # evict the least recently used entry
+            return value
+
+    def clear(self) -> None:
+        """
+        Remove every entry of the cache.
+        """
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+_images: LRUCache = LRUCache() # (asset, dimension, scaling) -> PIL image
+_photos: LRUCache = LRUCache() # (asset, dimension, scaling, tk interpreter) -> tkinter image
+_brightness_levels: LRUCache = LRUCache(maxsize=16) # (dimension, scaling, brightness) -> wheel image at that brightness
+_lightness_levels: LRUCache = LRUCache(maxsize=16) # (dimension, scaling, level) -> perceptual wheel image at that lightness
+_persisted: set = set() # (asset, dimension, cache directory) whose image is known to be in the directory
+
+def _load_image(asset: str, dimension: int, cache_dir: str = None) -> Image.Image:
+    """
+    Build the image of an asset at the given size, or map it from the cache directory when it was already built.
+
+    params:
+        asset: str "wheel" or "target".
+        dimension: int The size of the image.
+        cache_dir: str The cache directory (None to always build the image).
+    raises:
+        ValueError if the asset is unknown
+    returns:
+        PIL.Image The image.
+    """
+
+    if asset == "wheel": factory = lambda: render_wheel(dimension)
+    elif asset == "target": factory = lambda: Image.open(os.path.join(PATH, 'target.png')).resize((dimension, dimension), Image.Resampling.LANCZOS)
+    else: raise ValueError(f"unknown asset: {asset}")
+
+    if cache_dir is None: return factory()
+    _persisted.add((asset, dimension, cache_dir))
+    return disk_cache.get_image(cache_dir, asset, dimension, factory)
+
+def get_image(asset: str, dimension: int, scaling: float = 1.0, cache_dir: str = None) -> Image.Image:
+    """
+    Get the PIL image of an asset, shared by every picker of the same size.
+    With a cache directory the image is written there once, even when a picker without that directory built it first.
+
+    params:
+        asset: str "wheel" or "target".
+        dimension: int The size of the image (already scaled).
+        scaling: float The scaling factor the dimension was computed with.
+        cache_dir: str Directory the image is persisted in between processes (None to keep it in memory only).
+    raises:
+        ValueError if the asset is unknown
+    returns:
+        PIL.Image The image (must not be modified).
+    """
+
+    image = _images.get((asset, dimension, scaling), lambda: _load_image(asset, dimension, cache_dir))
+    if cache_dir is not None and (asset, dimension, cache_dir) not in _persisted: # built for a picker without this cache directory
+        _persisted.add((asset, dimension, cache_dir))
+        if disk_cache.load_image(cache_dir, asset, dimension) is None: disk_cache.save_image(cache_dir, asset, image)
+    return image
+
+def get_photo_image(asset: str, dimension: int, scaling: float, master, cache_dir: str = None) -> ImageTk.PhotoImage:
+    """
+    Get the tkinter image of an asset, shared by every picker of the same size living in the same tk interpreter.
+
+    params:
+        asset: str "wheel" or "target".
+        dimension: int The size of the image (already scaled).
+        scaling: float The scaling factor the dimension was computed with.
+        master: tkinter.Misc Any widget of the interpreter the image is used in.
+        cache_dir: str Directory the image is persisted in between processes (None to keep it in memory only).
+    raises:
+        ValueError if the asset is unknown
+    returns:
+        ImageTk.PhotoImage The tkinter image.
+    """
+
+    image = get_image(asset, dimension, scaling, cache_dir) # also persists it when another picker created the tkinter image
+    return _photos.get((asset, dimension, scaling, master.tk), lambda: ImageTk.PhotoImage(image, master=master))
+
+def get_wheel_at_brightness(dimension: int, scaling: float, brightness: int, color_space: str = "rgb") -> Image.Image:
+    """
+    Get the wheel image darkened to a brightness level.
+    The level is applied to the cached full brightness wheel with a single lookup table pass, and the most recently used levels are kept.
+    The perceptual wheel is rendered at the lightness of the level from the cached gamut tables (see oklch_model).
+
+    params:
+        dimension: int The size of the wheel (already scaled).
+        scaling: float The scaling factor the dimension was computed with.
+        brightness: int The brightness in the range [0, 255].
+        color_space: str "rgb" for the hsv wheel, "oklch" for the perceptual wheel.
+    raises:
+        None
+    returns:
+        PIL.Image The wheel image (must not be modified).
+    """
+
+    if color_space == "oklch": return _lightness_levels.get((dimension, scaling, brightness), lambda: oklch_model.render_wheel(dimension, brightness))
+
+    wheel = get_image("wheel", dimension, scaling)
+    if brightness >= 255: return wheel
+
+    table = [value * brightness // 255 for value in range(256)]
+    return _brightness_levels.get((dimension, scaling, brightness), lambda: wheel.point(table * 3 + list(range(256)))) # scale r, g and b, keep alpha
+
+def clear() -> None:
+    """
+    Drop every cached image (for example before destroying the tk interpreter).
+    """
+    _photos.clear()
+    _brightness_levels.clear()
+    _lightness_levels.clear()
+    _images.clear()
+    _persisted.clear()
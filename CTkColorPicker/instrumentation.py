@@ -0,0 +1,112 @@
+# Opt-in instrumentation of the CTk Color Picker hot paths
+# Measures the stages of the pickers (drag handling, color lookup, widget reconfiguration, user callback) and counts the handled and dropped events.
+# Every measure is logged at debug level on the "CTkColorPicker" logger and given to an optional hook, pickers without instrumentation only pay a None check.
+
+import logging, time
+
+logger: logging.Logger = logging.getLogger("CTkColorPicker")
+
+STAGES: tuple[str, ...] = ("drag", "lookup", "reconfigure", "callback") # stages measured by the pickers
+COUNTERS: tuple[str, ...] = ("events_processed", "events_dropped", "commands_called", "commands_dropped") # counters updated by the pickers
+
+class StageStats:
+    """
+    Number of runs, total and longest duration of a stage (in seconds).
+    """
+
+    __slots__ = ("count", "total", "maximum")
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total: float = 0.0
+        self.maximum: float = 0.0
+
+class Instrumentation:
+    """
+    Collect the durations of the stages and the event counters of one or several pickers.
+
+    usage:
+        instrumentation = Instrumentation(hook=lambda stage, duration: ...)
+        picker = CTkColorPicker(root, instrumentation=instrumentation)
+        ...
+        print(instrumentation.summary())
+    """
+
+    now = staticmethod(time.perf_counter) # clock of the measures
+
+    def __init__(self, hook = None) -> None:
+        """
+        params:
+            hook: callable Called with the stage name and its duration in seconds after every measure (on the tk thread).
+        raises:
+            None
+        returns:
+            None
+        """
+
+        self.hook = hook
+        self.stages: dict[str, StageStats] = {stage: StageStats() for stage in STAGES}
+        self.counters: dict[str, int] = dict.fromkeys(COUNTERS, 0)
+
+    def record(self, stage: str, start: float) -> float:
+        """
+        Record the duration of a stage started at a time given by now().
+
+        params:
+            stage: str The name of the stage.
+            start: float The start time of the stage.
+        raises:
+            None
+        returns:
+            float The end time (can be used as the start of the next stage).
+        """
+
+        end = time.perf_counter()
+        duration = end - start
+
+        stats = self.stages.get(stage) or self.stages.setdefault(stage, StageStats())
+        stats.count += 1
+        stats.total += duration
+        if duration > stats.maximum: stats.maximum = duration
+
+        if self.hook is not None: self.hook(stage, duration)
+        if logger.isEnabledFor(logging.DEBUG): logger.debug("%s: %.3f ms", stage, duration * 1000)
+        return end
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """
+        Increase a counter.
+
+        params:
+            counter: str The name of the counter.
+            amount: int The increment.
+        raises:
+            None
+        returns:
+            None
+        """
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def summary(self) -> dict:
+        """
+        Summarize the measures.
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            dict The count, total, mean and max duration (milliseconds) of every stage that ran, and the counters.
+        """
+
+        stages = {stage: {"count": stats.count, "total_ms": round(stats.total * 1000, 4), "mean_ms": round(stats.total / stats.count * 1000, 4), "max_ms": round(stats.maximum * 1000, 4)}
+                  for stage, stats in self.stages.items() if stats.count}
+        return {"stages": stages, "counters": dict(self.counters)}
+
+    def reset(self) -> None:
+        """
+        Forget every measure and counter.
+        """
+
+        for stats in self.stages.values(): stats.count, stats.total, stats.maximum = 0, 0.0, 0.0
+        for counter in self.counters: self.counters[counter] = 0
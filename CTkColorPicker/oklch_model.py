@@ -0,0 +1,306 @@
+# Perceptual (OKLCH) model of the CTk Color Picker wheel
+# Hue is the angle around the center like the hsv wheel, the distance from the center is the chroma relative to the most saturated srgb color of that hue and lightness,
+# and the brightness slider sets the oklch lightness, so colors of the same slider level look equally light whatever their hue.
+# The gamut limit of every hue is computed once per lightness level and cached, slider ticks only interpolate these tables (no gamut search per pixel).
+# The color math is pure python, numpy is only used to build the tables and render the wheel when it is installed.
+
+from math import cos, sin, hypot, tau
+import functools
+from .color_conversion import ENCODING_STEPS, LMS_TO_LINEAR, OKLAB_TO_LMS, encoding_table, oklab_to_linear_rgb, oklab_to_linear_rgb_batch, oklch_to_rgb, rgb_to_oklch
+from .wheel_model import coords_to_hs, hs_to_coords, wheel_maps
+
+HUE_STEPS: int = 360 # hues of the gamut tables, the limits of the hues in between are interpolated
+LEVELS: int = 256 # lightness levels, one per value of the brightness slider
+MAX_CHROMA: float = 0.4 # upper bound of the srgb chroma (the largest is about 0.32, for blue)
+SEARCH_STEPS: int = 24 # bisection steps of the gamut search (precision of MAX_CHROMA / 2**24)
+GAMUT_TOLERANCE: float = 1e-3 # linear channels this far below 0, relative to the largest channel, or above 1 still count as inside
+                               # (the published matrices are not exact inverses, pure blue comes back with a green of -5e-4)
+
+def level_to_lightness(level: int) -> float:
+    """
+    Get the oklch lightness of a brightness slider level.
+
+    params:
+        level: int The level in the range [0, 255].
+    raises:
+        None
+    returns:
+        float The lightness in the range [0, 1].
+    """
+    return level / (LEVELS - 1)
+
+def _max_chroma(lightness: float, hue: float) -> float:
+    """
+    Find the largest chroma of a lightness and hue inside the srgb gamut (pure python bisection, used without numpy).
+    """
+
+    a, b = cos(hue * tau), sin(hue * tau) # oklab direction of the hue
+    low, high = 0.0, MAX_CHROMA
+    for _ in range(SEARCH_STEPS):
+        chroma = (low + high) / 2
+        linear = oklab_to_linear_rgb(lightness, chroma * a, chroma * b)
+        if min(linear) >= -GAMUT_TOLERANCE * max(linear) and max(linear) <= 1 + GAMUT_TOLERANCE: low = chroma
+        else: high = chroma
+    return low
+
+@functools.lru_cache(maxsize=LEVELS)
+def gamut_table(level: int) -> tuple[float, ...]:
+    """
+    Get the largest in-gamut chroma of every hue step at a lightness level, computed once per level.
+    Uses a vectorized bisection over every hue at once when numpy is installed.
+
+    params:
+        level: int The lightness level in the range [0, 255].
+    raises:
+        None
+    returns:
+        tuple[float, ...] HUE_STEPS + 1 chroma limits (the last one repeats the first so interpolation wraps around the wheel).
+    """
+
+    lightness = level_to_lightness(level)
+    try:
+        import numpy
+    except ImportError: # numpy is optional, the hues are searched one by one
+        limits = [_max_chroma(lightness, step / HUE_STEPS) for step in range(HUE_STEPS)]
+        return tuple(limits + limits[:1])
+
+    angles = numpy.arange(HUE_STEPS) / HUE_STEPS * tau
+    cosines, sines = numpy.cos(angles), numpy.sin(angles)
+    low, high = numpy.zeros(HUE_STEPS), numpy.full(HUE_STEPS, MAX_CHROMA)
+    for _ in range(SEARCH_STEPS):
+        chroma = (low + high) / 2
+        linear = oklab_to_linear_rgb_batch(lightness, chroma * cosines, chroma * sines)
+        largest = linear.max(axis=-1)
+        inside = (linear.min(axis=-1) >= -GAMUT_TOLERANCE * largest) & (largest <= 1 + GAMUT_TOLERANCE)
+        low = numpy.where(inside, chroma, low)
+        high = numpy.where(inside, high, chroma)
+    limits = low.tolist()
+    return tuple(limits + limits[:1])
+
+def chroma_limit(level: int, hue: float) -> float:
+    """
+    Get the largest in-gamut chroma of a hue at a lightness level (interpolated from the gamut table of the level).
+
+    params:
+        level: int The lightness level in the range [0, 255].
+        hue: float The hue in the range [0, 1).
+    raises:
+        None
+    returns:
+        float The chroma at the rim of the wheel.
+    """
+
+    table = gamut_table(level)
+    position = (hue % 1.0) * HUE_STEPS
+    step = int(position)
+    return table[step] + (table[step + 1] - table[step]) * (position - step)
+
+def coords_to_lch(x: float, y: float, dimension: int, level: int) -> tuple[float, float, float]:
+    """
+    Get the oklch color under a point of the wheel.
+
+    params:
+        x: float The x-coordinate of the point.
+        y: float The y-coordinate of the point.
+        dimension: int The size of the wheel.
+        level: int The lightness level in the range [0, 255].
+    raises:
+        None
+    returns:
+        tuple[float, float, float] The lightness, chroma and hue.
+    """
+
+    hue, saturation = coords_to_hs(x, y, dimension)
+    return level_to_lightness(level), saturation * chroma_limit(level, hue), hue
+
+def coords_to_rgb(x: float, y: float, dimension: int, level: int) -> list[int]:
+    """
+    Get the color under a point of the wheel.
+
+    params:
+        x: float The x-coordinate of the point.
+        y: float The y-coordinate of the point.
+        dimension: int The size of the wheel.
+        level: int The lightness level in the range [0, 255].
+    raises:
+        None
+    returns:
+        list[int] The color [r, g, b].
+    """
+    return oklch_to_rgb(*coords_to_lch(x, y, dimension, level))
+
+def rgb_to_level(color) -> int:
+    """
+    Get the lightness level of a color (the value of the brightness slider showing it).
+
+    params:
+        color: tuple[int, int, int] The color (r, g, b).
+    raises:
+        None
+    returns:
+        int The level in the range [0, 255].
+    """
+    return min(max(round(rgb_to_oklch(color)[0] * (LEVELS - 1)), 0), LEVELS - 1)
+
+def rgb_to_lsh(color) -> tuple[float, float, float]:
+    """
+    Get the lightness, the chroma relative to the rim of the wheel at the lightness level of a color, and the hue.
+    The relative chroma goes above 1 for colors sharper than the rim: the level rounds their lightness and the published matrices are not exact inverses
+    (pure blue comes back with a green of -5e-4), so colors on the edges of the srgb cube are often just outside of the gamut of their level.
+
+    params:
+        color: tuple[int, int, int] The color (r, g, b).
+    raises:
+        None
+    returns:
+        tuple[float, float, float] The lightness, the relative chroma (0 for grays) and the hue.
+    """
+
+    lightness, chroma, hue = rgb_to_oklch(color)
+    limit = chroma_limit(rgb_to_level(color), hue)
+    return lightness, chroma / limit if limit > 0 else 0.0, hue
+
+def lsh_to_rgb(lightness: float, saturation: float, hue: float, level: int) -> list[int]:
+    """
+    Get a color from its relative chroma at a lightness level (the inverse of rgb_to_lsh at the level of the color).
+
+    params:
+        lightness: float The lightness in the range [0, 1].
+        saturation: float The chroma relative to the rim of the wheel at the level.
+        hue: float The hue in the range [0, 1).
+        level: int The lightness level giving the chroma limit.
+    raises:
+        None
+    returns:
+        list[int] The color [r, g, b] (clipped to the srgb gamut).
+    """
+    return oklch_to_rgb(lightness, saturation * chroma_limit(level, hue), hue)
+
+def rgb_to_coords(color, dimension: int) -> tuple[float, float]:
+    """
+    Get the point of the wheel showing a color at its lightness level (colors sharper than the rim go on the rim).
+
+    params:
+        color: tuple[int, int, int] The color (r, g, b).
+        dimension: int The size of the wheel.
+    raises:
+        None
+    returns:
+        tuple[float, float] The x and y coordinates of the color (the center of the wheel for grays).
+    """
+
+    _, saturation, hue = rgb_to_lsh(color)
+    return hs_to_coords(hue, min(saturation, 1.0), dimension)
+
+@functools.lru_cache(maxsize=4)
+def _wheel_geometry(dimension: int):
+    """
+    Get the per pixel data of the wheel that does not depend on the lightness (needs numpy).
+    The lightness only adds a constant to the cube roots of lms, so their chroma dependent part is stored per unit of chroma limit.
+
+    params:
+        dimension: int The size of the wheel.
+    raises:
+        None
+    returns:
+        tuple The hue steps surrounding every pixel and the interpolation factor between them, the l, m and s cube roots per unit of chroma limit (float32),
+        the mask of the rgb bits of the visible pixels and the alpha bits (uint32, one pixel per value).
+    """
+
+    import numpy
+
+    hue, saturation, alpha = wheel_maps(dimension)
+    hue, saturation, alpha = hue.ravel(), saturation.ravel(), alpha.ravel()
+    position = hue * HUE_STEPS
+    step = position.astype(numpy.intp)
+    a, b = saturation * numpy.cos(hue * tau), saturation * numpy.sin(hue * tau)
+    lms = [(row[1] * a + row[2] * b).astype(numpy.float32) for row in OKLAB_TO_LMS]
+    mask = numpy.where(alpha > 0, numpy.uint32(0xffffff), numpy.uint32(0)) # fully transparent pixels stay black, like the hsv wheel
+    return step, step + 1, (position - step).astype(numpy.float32), lms, mask, alpha.astype(numpy.uint32) << 24
+
+@functools.lru_cache(maxsize=1)
+def _channel_tables():
+    """
+    Get the encoding table shifted to the r, g and b bytes of a little endian RGBA pixel (needs numpy).
+    """
+
+    import numpy
+    table = encoding_table().astype(numpy.uint32)
+    return table, table << 8, table << 16
+
+def render_wheel(dimension: int, level: int) -> "PIL.Image.Image":
+    """
+    Render the perceptual wheel at a lightness level as an RGBA image, transparent outside of the circle.
+    With numpy, the lightness independent geometry is cached per size and a new level only costs the table interpolation and one float32 pass per channel,
+    whose results are packed into the pixels with lookup tables (channels are within one level of coords_to_rgb).
+    Use image_cache.get_wheel_at_brightness(..., color_space="oklch") to get a shared copy instead of rendering it again.
+
+    params:
+        dimension: int The size of the wheel (already scaled).
+        level: int The lightness level in the range [0, 255].
+    raises:
+        None
+    returns:
+        PIL.Image The wheel image.
+    """
+
+    try:
+        import numpy
+    except ImportError: # numpy is optional, without it the wheel is rendered in pure python
+        return _render_wheel_python(dimension, level)
+    from PIL import Image
+
+    step, next_step, fraction, lms_units, mask, pixels = _wheel_geometry(dimension)
+    table = numpy.asarray(gamut_table(level), dtype=numpy.float32)
+    limit = table.take(step)
+    delta = table.take(next_step)
+    delta -= limit
+    delta *= fraction
+    limit += delta
+
+    lightness = numpy.float32(level_to_lightness(level))
+    lms = []
+    for unit in lms_units: # cube of lightness + chroma part, computed in place
+        root = unit * limit
+        root += lightness
+        lms.append(root * root * root)
+
+    pixels = pixels.copy() # alpha bits
+    for row, channel_table in zip(LMS_TO_LINEAR, _channel_tables()):
+        channel = lms[0] * numpy.float32(row[0])
+        channel += lms[1] * numpy.float32(row[1])
+        channel += lms[2] * numpy.float32(row[2])
+        numpy.clip(channel, 0.0, 1.0, out=channel)
+        channel *= ENCODING_STEPS
+        channel += 0.5
+        pixels |= channel_table.take(channel.astype(numpy.uint16)) & mask
+    return Image.frombuffer("RGBA", (dimension, dimension), pixels, "raw", "RGBA", 0, 1)
+
+def _render_wheel_python(dimension: int, level: int) -> "PIL.Image.Image":
+    """
+    Pure python fallback of render_wheel, used when numpy is not installed.
+
+    params:
+        dimension: int The size of the wheel (already scaled).
+        level: int The lightness level in the range [0, 255].
+    raises:
+        None
+    returns:
+        PIL.Image The wheel image.
+    """
+
+    from PIL import Image
+
+    radius = dimension / 2
+    data = bytearray(dimension * dimension * 4)
+    position = 0
+
+    for j in range(dimension):
+        dy = radius - j
+        for i in range(dimension):
+            alpha = radius - hypot(i - radius, dy) + 0.5 # anti-aliased rim
+            alpha = 255 if alpha >= 1 else int(alpha * 255) if alpha > 0 else 0
+            if alpha: data[position:position + 4] = bytes((*coords_to_rgb(i, j, dimension, level), alpha))
+            position += 4
+
+    return Image.frombytes("RGBA", (dimension, dimension), bytes(data))
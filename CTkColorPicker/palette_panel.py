@@ -0,0 +1,283 @@
+# Palette panel of the CTk Color Picker (saved or recent colors shown as a grid of swatches)
+# Swatches are rectangles of a single canvas, not widgets, and only the visible rows exist:
+# a fixed pool of items is moved while scrolling and recolored when a new row comes into view, so thousands of colors cost the same as a few.
+
+import math, tkinter, customtkinter
+
+class PalettePanel(customtkinter.CTkFrame):
+
+    def __init__(self,
+                 master: any = None,
+                 colors: list[str] = None,
+                 command = None,
+                 width: int = 200,
+                 rows: int = 2,
+                 swatch_size: int = 20,
+                 spacing: int = 4,
+                 fg_color: str = None,
+                 selected_color: str = ("#000000", "#ffffff"),
+                 **kwargs) -> None:
+        """
+        Create the panel.
+
+        params:
+            master: any The parent widget.
+            colors: list[str] The colors of the palette as hex strings.
+            command: callable Called with the hex color of a swatch when it is clicked.
+            width: int The width of the panel (the number of columns depends on it).
+            rows: int The number of visible rows (more rows are scrolled).
+            swatch_size: int The size of a swatch.
+            spacing: int The space between two swatches.
+            fg_color: str The background color of the panel.
+            selected_color: str | tuple[str, str] The outline color of the selected swatch (light, dark).
+            **kwargs: Other CTkFrame arguments.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        super().__init__(master=master, fg_color=fg_color, **kwargs)
+
+        self.command = command # command to execute when a swatch is clicked
+        self.colors: list[str] = list(colors or []) # colors of the palette
+        self.selected: int = None # index of the selected swatch
+        self.selected_color = selected_color # outline of the selected swatch
+
+        self.swatch_size: int = int(self._apply_widget_scaling(swatch_size)) # size of a swatch
+        self.pitch: int = self.swatch_size + int(self._apply_widget_scaling(spacing)) # distance between the origins of two swatches
+        self.view_width: int = int(self._apply_widget_scaling(width))
+        self.view_height: int = rows * self.pitch
+        self.columns: int = max(1, self.view_width // self.pitch) # swatches per row
+        self.visible_rows: int = rows + 1 # a partially scrolled view shows one more row
+
+        self.offset: float = 0 # scrolled distance in pixels
+        self.first_row: int = 0 # first row drawn by the item pool
+
+        self.canvas: tkinter.Canvas = tkinter.Canvas(self, width=self.view_width, height=self.view_height, highlightthickness=0,
+                                                     bg=self._apply_appearance_mode(self._fg_color if self._fg_color != "transparent" else self._bg_color))
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<MouseWheel>", self.on_mouse_wheel) # Windows and macOS
+        self.canvas.bind("<Button-4>", self.on_mouse_wheel) # X11
+        self.canvas.bind("<Button-5>", self.on_mouse_wheel)
+        self.scrollbar: customtkinter.CTkScrollbar = customtkinter.CTkScrollbar(self, orientation="vertical", height=self.view_height, command=self.yview)
+
+        # the pool of swatch items, created once and reused for every row that scrolls into view
+        self.items: list[int] = [self.canvas.create_rectangle(0, 0, 0, 0, width=0, state="hidden", tags="swatch")
+                                 for _ in range(self.visible_rows * self.columns)]
+
+        self.canvas.pack(side="left", padx=(5, 0), pady=5)
+        self.scrollbar.pack(side="right", fill="y", padx=(0, 2), pady=5)
+        self.redraw()
+
+    def content_height(self) -> int:
+        """
+        Get the height of all the rows of the palette.
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            int The height in pixels.
+        """
+        return math.ceil(len(self.colors) / self.columns) * self.pitch
+
+    def max_offset(self) -> int:
+        """
+        Get the largest scrolled distance (the last row at the bottom of the view).
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            int The distance in pixels.
+        """
+        return max(0, self.content_height() - self.view_height)
+
+    def redraw(self) -> None:
+        """
+        Place and color the item pool for the current scroll offset.
+        Only used when the rows shown change, scrolling inside a row only moves the items (see scroll_to).
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            None
+        """
+
+        self.first_row = int(self.offset // self.pitch)
+        top = self.first_row * self.pitch - self.offset
+        outline = self._apply_appearance_mode(self.selected_color)
+
+        for slot, item in enumerate(self.items):
+            row, column = divmod(slot, self.columns)
+            index = (self.first_row + row) * self.columns + column
+            if index >= len(self.colors):
+                self.canvas.itemconfigure(item, state="hidden")
+                continue
+
+            x, y = column * self.pitch, top + row * self.pitch
+            self.canvas.coords(item, x + 1, y + 1, x + self.swatch_size, y + self.swatch_size)
+            if index == self.selected: self.canvas.itemconfigure(item, fill=self.colors[index], outline=outline, width=2, state="normal")
+            else: self.canvas.itemconfigure(item, fill=self.colors[index], width=0, state="normal")
+
+        self.update_scrollbar()
+
+    def update_scrollbar(self) -> None:
+        """
+        Show the visible part of the palette on the scrollbar.
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            None
+        """
+
+        height = self.content_height()
+        if height <= self.view_height: self.scrollbar.set(0, 1)
+        else: self.scrollbar.set(self.offset / height, (self.offset + self.view_height) / height)
+
+    def scroll_to(self, offset: float) -> None:
+        """
+        Scroll the palette to a distance from its top.
+        When the same rows stay visible the items are moved with a single canvas call, otherwise the pool is redrawn.
+
+        params:
+            offset: float The distance in pixels (clamped to the palette).
+        raises:
+            None
+        returns:
+            None
+        """
+
+        offset = min(max(offset, 0), self.max_offset())
+        if offset == self.offset: return
+
+        previous, self.offset = self.offset, offset
+        if int(offset // self.pitch) == self.first_row:
+            self.canvas.move("swatch", 0, previous - offset)
+            self.update_scrollbar()
+        else:
+            self.redraw()
+
+    def yview(self, *args) -> None:
+        """
+        Scroll command of the scrollbar ("moveto fraction" or "scroll number units|pages").
+
+        params:
+            *args: str The arguments of the scrollbar.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        if args[0] == "moveto": self.scroll_to(float(args[1]) * self.content_height())
+        elif args[0] == "scroll": self.scroll_to(self.offset + int(args[1]) * (self.view_height if args[2] == "pages" else self.pitch))
+
+    def on_mouse_wheel(self, event) -> None:
+        """
+        Scroll the palette by a third of a row per wheel notch.
+
+        params:
+            event: tkinter.Event The event object.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        if event.num == 4: steps = -1
+        elif event.num == 5: steps = 1
+        else: steps = -event.delta / (120 if abs(event.delta) >= 120 else 1) # Windows reports multiples of 120, macOS small deltas
+        self.scroll_to(self.offset + steps * self.pitch / 3)
+
+    def index_at(self, x: int, y: int) -> int:
+        """
+        Get the index of the swatch under a point of the canvas.
+
+        params:
+            x: int The x-coordinate of the point.
+            y: int The y-coordinate of the point.
+        raises:
+            None
+        returns:
+            int The index of the color, None if there is no swatch under the point.
+        """
+
+        column, row = int(x // self.pitch), int((y + self.offset) // self.pitch)
+        if column >= self.columns or x % self.pitch > self.swatch_size: return None
+        index = row * self.columns + column
+        return index if 0 <= index < len(self.colors) else None
+
+    def on_click(self, event) -> None:
+        """
+        Select the swatch under the pointer and call the command with its color.
+
+        params:
+            event: tkinter.Event The event object.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        index = self.index_at(event.x, event.y)
+        if index is None: return
+
+        self.select(index)
+        if self.command: self.command(self.colors[index])
+
+    def select(self, index: int) -> None:
+        """
+        Outline a swatch (None to clear the selection).
+
+        params:
+            index: int The index of the color.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        self.selected = index
+        self.redraw()
+
+    def set_colors(self, colors: list[str]) -> None:
+        """
+        Replace the colors of the palette and scroll back to the top.
+
+        params:
+            colors: list[str] The colors as hex strings.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        self.colors = list(colors)
+        self.selected = None
+        self.offset = 0
+        self.redraw()
+
+    def add_color(self, color: str) -> None:
+        """
+        Add a color at the end of the palette.
+
+        params:
+            color: str The color as a hex string.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        self.colors.append(color)
+        if (len(self.colors) - 1) // self.columns < self.first_row + self.visible_rows: self.redraw() # the new swatch is in view
+        else: self.update_scrollbar()
@@ -0,0 +1,159 @@
+# Group of CTk Color Picker widgets (forms showing many pickers at once)
+# Members share the wheel and target images of their size (see image_cache) and the closed form color lookups,
+# their commands are batched into a single call per frame with every color that changed, and colors are read and written as a dict.
+
+from .ctk_color_picker_widget import CTkColorPicker
+
+class PickerGroup:
+    """
+    Named CTkColorPicker widgets managed together.
+
+    usage:
+        group = PickerGroup(root, command=lambda changes: ...) # changes: {name: color} of the members changed during the frame
+        group.create("series 1", frame, width=200).pack()
+        group.set({"series 1": "#ff0000"})
+        colors = group.get() # {"series 1": "#ff0000"}
+    """
+
+    def __init__(self, master, command = None, max_fps: int = 60) -> None:
+        """
+        params:
+            master: tkinter.Misc Widget used to schedule the batched calls on the tk event loop.
+            command: callable Called once per frame with a dict {name: color} of the members whose color changed.
+            max_fps: int Maximum number of command calls per second.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        self.master = master
+        self.command = command
+        self.frame_interval: int = int(1000 / max_fps) if max_fps else 0 # milliseconds between two batched calls
+        self.members: dict[str, CTkColorPicker] = {} # name -> picker, in insertion order
+        self._changes: dict[str, str] = {} # colors waiting for the next batched call
+        self._job: str = None # id of the scheduled batched call
+
+    def create(self, name: str, master = None, **kwargs) -> CTkColorPicker:
+        """
+        Create a picker and add it to the group.
+
+        params:
+            name: str The name of the member.
+            master: tkinter.Misc The parent of the picker (the master of the group if None).
+            **kwargs: Other CTkColorPicker arguments (the command and its dispatch are set by the group, see add).
+        raises:
+            KeyError if the name is already used
+        returns:
+            CTkColorPicker The picker (not packed yet).
+        """
+
+        if name in self.members: raise KeyError(f"{name!r} is already a member of the group")
+        picker = CTkColorPicker(master if master is not None else self.master, **kwargs)
+        self.add(name, picker)
+        return picker
+
+    def add(self, name: str, picker: CTkColorPicker) -> None:
+        """
+        Add an existing picker to the group, its command is replaced by the batched command of the group.
+        The command then runs immediately on the tk thread (a command_executor or a debounce/throttle policy of the picker is dropped):
+        it schedules the batched call with after, which must not be called from another thread.
+
+        params:
+            name: str The name of the member.
+            picker: CTkColorPicker The picker.
+        raises:
+            KeyError if the name is already used
+        returns:
+            None
+        """
+
+        if name in self.members: raise KeyError(f"{name!r} is already a member of the group")
+        dispatcher = picker.command_dispatcher
+        dispatcher.cancel() # pending calls of the previous command
+        dispatcher.executor, dispatcher.policy = None, "immediate"
+        picker.command = dispatcher.command = self._member_command(name)
+        self.members[name] = picker
+
+    def remove(self, name: str) -> CTkColorPicker:
+        """
+        Remove a picker from the group (it is not destroyed and stops notifying the group).
+
+        params:
+            name: str The name of the member.
+        raises:
+            KeyError if there is no such member
+        returns:
+            CTkColorPicker The picker.
+        """
+
+        picker = self.members.pop(name)
+        picker.command = picker.command_dispatcher.command = None
+        self._changes.pop(name, None)
+        return picker
+
+    def _member_command(self, name: str):
+        """
+        Get the command given to a member: it only stores the color until the batched call.
+        """
+
+        def command(color: str) -> None:
+            self._changes[name] = color
+            if self._job is None: self._job = self.master.after(self.frame_interval, self._flush) if self.frame_interval else self.master.after_idle(self._flush)
+        return command
+
+    def _flush(self) -> None:
+        """
+        Call the command with the colors changed since the last call.
+        """
+
+        self._job = None
+        changes, self._changes = self._changes, {}
+        if changes and self.command: self.command(changes)
+
+    def get(self) -> dict[str, str]:
+        """
+        Get the colors of every member.
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            dict[str, str] The hex color of every member, by name.
+        """
+        return {name: picker.get() for name, picker in self.members.items()}
+
+    def set(self, colors: dict[str, str], notify: bool = False) -> None:
+        """
+        Set the colors of several members.
+
+        params:
+            colors: dict[str, str] The hex colors, by name.
+            notify: bool Report the new colors in the next batched command call.
+        raises:
+            KeyError if a name is not a member
+            ValueError if a color is not a valid hex color
+        returns:
+            None
+        """
+
+        for name, color in colors.items(): self.members[name].set_color(color, notify=notify)
+
+    def cancel(self) -> None:
+        """
+        Drop the pending batched call (for example before destroying the master).
+        """
+
+        if self._job is not None: self.master.after_cancel(self._job)
+        self._job = None
+        self._changes.clear()
+
+    def __getitem__(self, name: str) -> CTkColorPicker:
+        return self.members[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.members
+
+    def __len__(self) -> int:
+        return len(self.members)
@@ -0,0 +1,401 @@
+# View logic shared by the CTk Color Picker widgets
+# AskColor and CTkColorPicker show a ColorPickerState on a canvas with a brightness slider, this mixin holds what both do the same way:
+# the drag and nudge handling (immediate or coalesced once per frame), the target item, the wheel images, the brightness of the wheel and set_color.
+# The widgets provide the tk parts it uses (canvas, wheel_item, target_item or vector_target, brightness_slider_value) and show_color(notify).
+
+from PIL import ImageTk
+from .color_engine import projection_on_circle, COLOR_SPACES, NUDGE_KEYS, NUDGE_STEPS
+from .color_conversion import hex_to_rgb
+from .image_cache import get_image, get_photo_image, get_wheel_at_brightness
+
+class ColorPickerView:
+    """
+    Mixin of the color picker widgets, to be listed before the customtkinter base class.
+    """
+
+    # the picked color and the target position live in the state, these properties keep the widget attributes working
+    @property
+    def rgb_color(self) -> list[int]: return self.color_state.rgb_color
+    @rgb_color.setter
+    def rgb_color(self, value: list[int]) -> None: self.color_state.rgb_color = value
+
+    @property
+    def target_x(self) -> float: return self.color_state.target_x
+    @target_x.setter
+    def target_x(self, value: float) -> None: self.color_state.target_x = value
+
+    @property
+    def target_y(self) -> float: return self.color_state.target_y
+    @target_y.setter
+    def target_y(self, value: float) -> None: self.color_state.target_y = value
+
+    @staticmethod
+    def _check_options(update_mode: str, target_style: str, color_space: str) -> None:
+        """
+        Check the options of the picker, called by the widgets before their window or frame is created (nothing is left on screen when one is wrong).
+
+        params:
+            update_mode: str "immediate" or "latest".
+            target_style: str "image" or "vector".
+            color_space: str "rgb" or "oklch".
+        raises:
+            ValueError if an option is unknown
+        returns:
+            None
+        """
+
+        if update_mode not in ("immediate", "latest"): raise ValueError(f"update_mode must be 'immediate' or 'latest', not {update_mode!r}")
+        if target_style not in ("image", "vector"): raise ValueError(f"target_style must be 'image' or 'vector', not {target_style!r}")
+        if color_space not in COLOR_SPACES: raise ValueError(f"color_space must be 'rgb' or 'oklch', not {color_space!r}")
+
+    def _init_updates(self, update_mode: str, max_fps: int) -> None:
+        """
+        Set up the drag and nudge handling, called by the widgets before any event is bound (the update mode is checked by _check_options).
+
+        params:
+            update_mode: str "immediate" handles every drag event, "latest" only the most recent one once per frame.
+            max_fps: int Maximum number of coalesced updates per second (0 or None to update as soon as tk is idle).
+        raises:
+            None
+        returns:
+            None
+        """
+
+        self.update_mode: str = update_mode
+        self.frame_interval: int = int(1000 / max_fps) if max_fps else 0 # milliseconds between two coalesced updates (0 means as soon as tk is idle)
+        self._pending_drag: tuple[int, int] = None # most recent pointer position not handled yet
+        self._drag_job: str = None # id of the scheduled coalesced update
+        self._pending_nudge: list[float] = [0.0, 0.0, 0] # hue, saturation and brightness changes not applied yet (held keys repeat faster than a frame)
+        self._nudge_job: str = None # id of the scheduled nudge update
+
+    def on_mouse_press(self, event) -> None:
+        """
+        Pick the color under the pointer and give the focus to the canvas (for the nudge keys).
+
+        params:
+            event: tkinter.Event The event object.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        self.canvas.focus_set()
+        self.on_mouse_drag(event)
+
+    def on_mouse_drag(self, event) -> None:
+        """
+        Get the color of the target pixel and update the colors.
+        In "latest" update mode only the pointer position is stored and the update is done once per frame.
+
+        params:
+            event: tkinter.Event The event object.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        if self.update_mode == "immediate":
+            self.drag_to(event.x, event.y)
+            return
+
+        if self.instrumentation and self._pending_drag is not None: self.instrumentation.count("events_dropped")
+        self._pending_drag = (event.x, event.y) # older positions not handled yet are simply overwritten
+        if self._drag_job is None: # schedule a single update for the current frame
+            self._drag_job = self.after(self.frame_interval, self._flush_drag) if self.frame_interval else self.after_idle(self._flush_drag)
+
+    def _flush_drag(self) -> None:
+        """
+        Handle the most recent pointer position stored by on_mouse_drag.
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            None
+        """
+
+        self._drag_job = None
+        if self._pending_drag is None: return
+
+        x, y = self._pending_drag
+        self._pending_drag = None
+        self.drag_to(x, y)
+
+    def _cancel_drag(self) -> None:
+        """
+        Drop the pending coalesced drag and nudge updates and their pointer position and steps (used when the picker is closed or destroyed).
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            None
+        """
+
+        if self._drag_job is not None: self.after_cancel(self._drag_job)
+        if self._nudge_job is not None: self.after_cancel(self._nudge_job)
+        self._drag_job = self._nudge_job = None
+        self._pending_drag = None
+        self._pending_nudge = [0.0, 0.0, 0]
+
+    def on_key_nudge(self, event) -> None:
+        """
+        Nudge the color with the keyboard (steps are ten times larger with shift).
+
+        params:
+            event: tkinter.Event The event object.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        steps = NUDGE_KEYS.get(event.keysym)
+        if steps is None: return
+        factor = 10 if event.state & 0x1 else 1 # shift
+        self.nudge(steps[0] * factor, steps[1] * factor, steps[2] * factor)
+
+    def on_mouse_wheel(self, event) -> None:
+        """
+        Nudge the brightness (the hue with shift) with the mouse wheel.
+
+        params:
+            event: tkinter.Event The event object.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        if event.num == 4: steps = 1
+        elif event.num == 5: steps = -1
+        else: steps = event.delta // 120 if abs(event.delta) >= 120 else (event.delta > 0) - (event.delta < 0) # Windows reports multiples of 120, macOS small deltas
+        if event.state & 0x1: self.nudge(hue=steps)
+        else: self.nudge(brightness=steps)
+
+    def nudge(self, hue: float = 0, saturation: float = 0, brightness: int = 0) -> None:
+        """
+        Change the color by a number of steps (see NUDGE_STEPS).
+        The steps are summed and applied once per frame, so held keys cannot queue an update per repeat.
+
+        params:
+            hue: float The number of hue steps.
+            saturation: float The number of saturation steps.
+            brightness: int The number of brightness steps.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        pending = self._pending_nudge
+        pending[0] += hue
+        pending[1] += saturation
+        pending[2] += brightness
+        if self.instrumentation and self._nudge_job is not None: self.instrumentation.count("events_dropped") # merged into the scheduled update
+        if self._nudge_job is None: self._nudge_job = self.after(self.frame_interval, self._flush_nudge) if self.frame_interval else self.after_idle(self._flush_nudge)
+
+    def _flush_nudge(self) -> None:
+        """
+        Apply the steps summed by nudge, from the current position of the target (no color lookup).
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            None
+        """
+
+        self._nudge_job = None
+        hue, saturation, brightness = self._pending_nudge
+        self._pending_nudge = [0.0, 0.0, 0]
+
+        if brightness:
+            self.brightness_slider_value.set(min(max(self.brightness_slider_value.get() + brightness * NUDGE_STEPS[2], 0), 255))
+            if self.live_brightness: self.update_wheel_brightness()
+        self.color_state.brightness = self.brightness_slider_value.get()
+        self.color_state.nudge(hue * NUDGE_STEPS[0], saturation * NUDGE_STEPS[1])
+
+        self.move_target()
+        self.show_color()
+
+    def drag_to(self, x: int, y: int) -> None:
+        """
+        Move the target to a pointer position and update the colors.
+
+        params:
+            x: int The x-coordinate of the pointer on the canvas.
+            y: int The y-coordinate of the pointer on the canvas.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        instrumentation = self.instrumentation
+        if instrumentation: start = instrumentation.now()
+
+        self.color_state.brightness = self.brightness_slider_value.get()
+        self.color_state.move_to(x, y) # positions outside of the wheel are projected on its rim
+        if instrumentation: instrumentation.record("lookup", start)
+
+        self.move_target() # move the target (the wheel is left untouched)
+        self.show_color() # update the colors
+
+        if instrumentation:
+            instrumentation.record("drag", start)
+            instrumentation.count("events_processed")
+
+    def move_target(self) -> None:
+        """
+        Move the target to the position of the state.
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            None
+        """
+
+        if self.vector_target is not None: self.vector_target.move(self.target_x, self.target_y)
+        else: self.canvas.coords(self.target_item, self.target_x, self.target_y)
+
+    def load_images(self, event=None) -> None:
+        """
+        Build the images (shared with every other picker of the same size) and show them on the canvas.
+        Called when the canvas is shown for the first time, later calls do nothing.
+
+        params:
+            event: tkinter.Event The <Map> event object.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        if self.wheel is not None: return # already loaded
+
+        if self.color_space == "oklch": # the perceptual wheel is rendered at the lightness of the slider from the cached gamut tables
+            self.shown_brightness = self.brightness_slider_value.get()
+            self.color_wheel_image = get_wheel_at_brightness(self.image_dimension, self.image_scaling, self.shown_brightness, self.color_space)
+        else: self.color_wheel_image = get_image("wheel", self.image_dimension, self.image_scaling, self.cache_dir) # the wheel is rendered from the hsv model so it matches the color math exactly
+
+        # convert the images to tkinter images
+        if self.live_brightness: self.wheel = ImageTk.PhotoImage(self.color_wheel_image, master=self) # own copy, its pixels are replaced when the slider moves
+        else: self.wheel = get_photo_image("wheel", self.image_dimension, self.image_scaling, self, self.cache_dir)
+        self.canvas.itemconfigure(self.wheel_item, image=self.wheel)
+
+        if self.target_item is not None and self.target is None: # the vector target needs no image
+            self.target_image = get_image("target", self.target_dimension, self.image_scaling, self.cache_dir)
+            self.target = get_photo_image("target", self.target_dimension, self.image_scaling, self, self.cache_dir)
+            self.canvas.itemconfigure(self.target_item, image=self.target)
+        if self.live_brightness: self.update_wheel_brightness() # the slider may have moved before the first display
+
+    def on_brightness_changed(self, value) -> None:
+        """
+        Update the wheel (in live brightness mode) and the colors when the brightness slider moves.
+
+        params:
+            value: float The value of the slider.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        if self.live_brightness: self.update_wheel_brightness()
+        self.update_colors()
+
+    def update_wheel_brightness(self) -> None:
+        """
+        Show the wheel at the brightness of the slider.
+        The darkened wheel comes from a cache of recent brightness levels and is pasted into the existing tkinter image.
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            None
+        """
+
+        brightness = self.brightness_slider_value.get()
+        if self.wheel is None or brightness == self.shown_brightness: return # not shown yet or nothing changed
+
+        self.wheel.paste(get_wheel_at_brightness(self.image_dimension, self.image_scaling, brightness, self.color_space))
+        self.shown_brightness = brightness
+
+    def update_colors(self) -> None:
+        """
+        Update the colors of the slider and the label.
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            None
+        """
+
+        self.color_state.set_brightness(self.brightness_slider_value.get()) # color of the target pixel at the current brightness
+        self.show_color()
+
+    def set_color(self, color: str, notify: bool = True) -> None:
+        """
+        Show a color: the target moves to its hue and saturation and the slider to its brightness.
+
+        params:
+            color: str The hex color.
+            notify: bool Give the color to the command.
+        raises:
+            ValueError if the color is not a valid hex color
+        returns:
+            None
+        """
+
+        rgb = hex_to_rgb(color)
+        self.color_state.set_color(rgb) # closed form lookup of the color on the wheel
+        self.color_state.brightness = self.color_state.brightness_of(rgb)
+        self.brightness_slider_value.set(self.color_state.brightness)
+        if self.live_brightness: self.update_wheel_brightness()
+
+        self.move_target() # move the target
+        self.show_color(notify)
+
+    def get_target_color(self) -> None:
+        """
+        Get the color of the target pixel (full brightness).
+
+        params:
+            None
+        raises:
+            None
+        returns:
+            None
+        """
+
+        self.rgb_color = self.color_state.wheel_color() # closed form, no image sampling
+
+    def projection_on_circle(self, point_x, point_y, circle_x, circle_y, radius) -> tuple[float, float]:
+        """
+        Get the projection of a point on a circle.
+        Used to figure out the closest point on the circle to the given point to place the target on the color wheel even if the user presses outside of it.
+
+        params:
+            point_x: int The x-coordinate of the point.
+            point_y: int The y-coordinate of the point.
+            circle_x: int The x-coordinate of the center of the circle.
+            circle_y: int The y-coordinate of the center of the circle.
+            radius: int The radius of the circle.
+        raises:
+            None
+        returns:
+            tuple[float, float] The x and y coordinates of the projection.
+        """
+        return projection_on_circle(point_x, point_y, circle_x, circle_y, radius)
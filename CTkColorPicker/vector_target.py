@@ -0,0 +1,70 @@
+# Target of the CTk Color Picker drawn with canvas items
+# Two concentric rings in contrasting colors, so the target is visible on any color and crisp at any scaling.
+# Moving and recoloring are single canvas calls, no image is decoded, resized or kept per picker.
+
+import tkinter
+
+class VectorTarget:
+    """
+    Target marker made of two concentric canvas ovals.
+    """
+
+    def __init__(self, canvas: tkinter.Canvas, x: float, y: float, dimension: int, width: int = 2) -> None:
+        """
+        Draw the target.
+
+        params:
+            canvas: tkinter.Canvas The canvas of the wheel.
+            x: float The x-coordinate of the center of the target.
+            y: float The y-coordinate of the center of the target.
+            dimension: int The diameter of the target (already scaled).
+            width: int The width of each ring (already scaled).
+        raises:
+            None
+        returns:
+            None
+        """
+
+        self.canvas: tkinter.Canvas = canvas
+        self.tag: str = f"target{id(self)}" # both rings, moved together
+        self.x: float = x
+        self.y: float = y
+        self.outline: str = "black" # color of the outer ring, the inner ring has the opposite one
+
+        outer, inner = dimension / 2 - width / 2, dimension / 2 - width * 1.5
+        self.outer_item: int = canvas.create_oval(x - outer, y - outer, x + outer, y + outer, width=width, outline="black", tags=self.tag)
+        self.inner_item: int = canvas.create_oval(x - inner, y - inner, x + inner, y + inner, width=width, outline="white", tags=self.tag)
+
+    def move(self, x: float, y: float) -> None:
+        """
+        Move the center of the target.
+
+        params:
+            x: float The new x-coordinate.
+            y: float The new y-coordinate.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        if x == self.x and y == self.y: return
+        self.canvas.move(self.tag, x - self.x, y - self.y) # one call for both rings
+        self.x, self.y = x, y
+
+    def recolor(self, outline: str) -> None:
+        """
+        Set the color of the outer ring (the inner ring gets the opposite color).
+
+        params:
+            outline: str "black" or "white", the color contrasting with the picked color.
+        raises:
+            None
+        returns:
+            None
+        """
+
+        if outline == self.outline: return
+        self.canvas.itemconfigure(self.outer_item, outline=outline)
+        self.canvas.itemconfigure(self.inner_item, outline="black" if outline == "white" else "white")
+        self.outline = outline
@@ -0,0 +1,163 @@
+# Analytic HSV model of the CTk Color Picker wheel
+# Hue is the angle around the center (red on the right, counterclockwise), saturation is the distance from the center.
+# Brightness is not part of the wheel, it is applied afterwards with the slider.
+# PIL and numpy are only imported by the rendering functions, so the color math can be used without loading them.
+
+from math import atan2, cos, sin, hypot, tau
+from .color_conversion import hsv_to_rgb, hsv_to_rgb_batch, rgb_to_hsv
+
+def coords_to_hs(x: float, y: float, dimension: int) -> tuple[float, float]:
+    """
+    Get the hue and the saturation under a point of the wheel.
+
+    params:
+        x: float The x-coordinate of the point.
+        y: float The y-coordinate of the point.
+        dimension: int The size of the wheel.
+    raises:
+        None
+    returns:
+        tuple[float, float] The hue in the range [0, 1) and the saturation in the range [0, 1] (points outside the wheel are clamped to its rim).
+    """
+
+    radius = dimension / 2
+    dx, dy = x - radius, radius - y # canvas y axis points down
+    hue = (atan2(dy, dx) / tau) % 1.0
+    saturation = min(hypot(dx, dy) / radius, 1.0)
+    return hue, saturation
+
+def coords_to_rgb(x: float, y: float, dimension: int) -> list[int]:
+    """
+    Get the color under a point of the wheel.
+
+    params:
+        x: float The x-coordinate of the point.
+        y: float The y-coordinate of the point.
+        dimension: int The size of the wheel.
+    raises:
+        None
+    returns:
+        list[int] The color [r, g, b].
+    """
+    return hsv_to_rgb(*coords_to_hs(x, y, dimension))
+
+def hs_to_coords(hue: float, saturation: float, dimension: int) -> tuple[float, float]:
+    """
+    Get the point of the wheel showing a hue and a saturation.
+
+    params:
+        hue: float The hue in the range [0, 1).
+        saturation: float The saturation in the range [0, 1].
+        dimension: int The size of the wheel.
+    raises:
+        None
+    returns:
+        tuple[float, float] The x and y coordinates of the point.
+    """
+
+    radius = dimension / 2
+    distance = saturation * radius
+    return radius + distance * cos(hue * tau), radius - distance * sin(hue * tau)
+
+def rgb_to_coords(color, dimension: int) -> tuple[float, float]:
+    """
+    Get the point of the wheel showing a color.
+    The brightness of the color is ignored because it is not part of the wheel (it is set with the slider).
+
+    params:
+        color: tuple[int, int, int] The color (r, g, b).
+        dimension: int The size of the wheel.
+    raises:
+        None
+    returns:
+        tuple[float, float] The x and y coordinates of the color (the center of the wheel for black).
+    """
+
+    hue, saturation, _ = rgb_to_hsv(color)
+    return hs_to_coords(hue, saturation, dimension)
+
+def wheel_maps(dimension: int):
+    """
+    Compute the hue, saturation and alpha of every pixel of the wheel in one vectorized pass (needs numpy).
+    Pixel (x, y) holds exactly coords_to_hs(x, y, dimension), so the rendered wheel and the color lookups always agree.
+
+    params:
+        dimension: int The size of the wheel.
+    raises:
+        None
+    returns:
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray] The hue and saturation maps (float64) and the alpha map (uint8), indexed [y, x].
+    """
+
+    import numpy
+
+    radius = dimension / 2
+    coordinates = numpy.arange(dimension, dtype=numpy.float64)
+    dx = (coordinates - radius)[numpy.newaxis, :]
+    dy = (radius - coordinates)[:, numpy.newaxis] # canvas y axis points down
+    distance = numpy.hypot(dx, dy)
+
+    hue = numpy.mod(numpy.arctan2(dy, dx) / tau, 1.0)
+    saturation = numpy.minimum(distance / radius, 1.0)
+    alpha = (numpy.clip(radius - distance + 0.5, 0.0, 1.0) * 255).astype(numpy.uint8) # anti-aliased rim
+    return hue, saturation, alpha
+
+def render_wheel(dimension: int, brightness: int = 255) -> "PIL.Image.Image":
+    """
+    Render the wheel as an RGBA image, transparent outside of the circle.
+    Uses numpy when it is installed, a pure python loop otherwise.
+    Use image_cache.get_image("wheel", ...) to get a shared copy instead of rendering it again.
+
+    params:
+        dimension: int The size of the wheel (already scaled).
+        brightness: int The brightness the wheel is shown at, in the range [0, 255].
+    raises:
+        None
+    returns:
+        PIL.Image The wheel image.
+    """
+
+    try:
+        import numpy
+    except ImportError: # numpy is optional, without it the wheel is rendered in pure python
+        return _render_wheel_python(dimension, brightness)
+    from PIL import Image
+
+    hue, saturation, alpha = wheel_maps(dimension)
+    rgb = hsv_to_rgb_batch(hue, saturation)
+    if brightness != 255: rgb = (rgb.astype(numpy.uint16) * brightness // 255).astype(numpy.uint8)
+    rgb[alpha == 0] = 0 # same fully transparent pixels as the pure python renderer
+    return Image.fromarray(numpy.dstack((rgb, alpha)))
+
+def _render_wheel_python(dimension: int, brightness: int = 255) -> "PIL.Image.Image":
+    """
+    Pure python fallback of render_wheel, used when numpy is not installed.
+
+    params:
+        dimension: int The size of the wheel (already scaled).
+        brightness: int The brightness the wheel is shown at, in the range [0, 255].
+    raises:
+        None
+    returns:
+        PIL.Image The wheel image.
+    """
+
+    from PIL import Image
+
+    radius = dimension / 2
+    data = bytearray(dimension * dimension * 4)
+    position = 0
+
+    for j in range(dimension):
+        dy = radius - j
+        for i in range(dimension):
+            dx = i - radius
+            distance = hypot(dx, dy)
+            alpha = radius - distance + 0.5 # anti-aliased rim
+            alpha = 255 if alpha >= 1 else int(alpha * 255) if alpha > 0 else 0
+            if alpha:
+                r, g, b = hsv_to_rgb((atan2(dy, dx) / tau) % 1.0, min(distance / radius, 1.0))
+                data[position:position + 4] = bytes((r * brightness // 255, g * brightness // 255, b * brightness // 255, alpha))
+            position += 4
+
+    return Image.frombytes("RGBA", (dimension, dimension), bytes(data))
@@ -0,0 +1,56 @@
+# Live brightness benchmark for the CTk Color Picker wheel
+# Measures the cost of one brightness slider tick in live brightness mode (darkened wheel + PhotoImage.paste) at 400px.
+# The paste part needs a display (xvfb-run python benchmarks/bench_brightness.py), without one only the image part is measured.
+
+import os, sys, time, tkinter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from PIL import ImageTk
+from CTkColorPicker import image_cache
+
+DIMENSION: int = 400 # wheel size in pixels
+FRAME_BUDGET: float = 1000 / 60 # milliseconds available per frame at 60 fps
+
+def sweep(photo: ImageTk.PhotoImage = None, cached: bool = False) -> list[float]:
+    """
+    Move the brightness from 255 down to 0 and measure every tick.
+
+    params:
+        photo: ImageTk.PhotoImage Tkinter image the darkened wheel is pasted into (None to skip the paste).
+        cached: bool Keep the brightness level cache between ticks (False measures the worst case of a level never seen before).
+    raises:
+        None
+    returns:
+        list[float] The duration of every tick in milliseconds.
+    """
+
+    durations = []
+    for brightness in range(255, -1, -1):
+        if not cached: image_cache._brightness_levels.clear()
+
+        start = time.perf_counter()
+        image = image_cache.get_wheel_at_brightness(DIMENSION, 1.0, brightness)
+        if photo is not None: photo.paste(image)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+def report(name: str, durations: list[float]) -> None:
+    durations = sorted(durations)
+    print(f"{name}: mean {sum(durations) / len(durations):.2f} ms, p95 {durations[int(len(durations) * 0.95)]:.2f} ms, max {durations[-1]:.2f} ms "
+          f"({'within' if durations[-1] < FRAME_BUDGET else 'OVER'} the {FRAME_BUDGET:.1f} ms frame budget)")
+
+if __name__ == "__main__":
+    image_cache.get_image("wheel", DIMENSION, 1.0) # the base wheel is rendered once, outside of the measure
+
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError: # no display
+        root = None
+
+    photo = ImageTk.PhotoImage(image_cache.get_image("wheel", DIMENSION, 1.0), master=root) if root else None
+
+    report("uncached level" + (" + paste" if photo else ""), sweep(photo))
+    report("cached level" + (" + paste" if photo else ""), sweep(photo, cached=True))
+
+    if root: root.destroy()
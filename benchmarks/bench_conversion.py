@@ -0,0 +1,84 @@
+# Color conversion benchmark of the CTk Color Picker
+# Compares the lookup table conversions of color_conversion with the str.format / int(..., 16) code they replaced,
+# for single colors (drag hot path) and for palettes (batch functions, with lists and numpy arrays).
+# No display needed: python benchmarks/bench_conversion.py
+
+import json, os, random, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from CTkColorPicker import color_conversion
+
+PALETTE_SIZE: int = 10000 # number of colors of the batch benchmarks
+
+def per_second(function, *arguments, repeat: int = 5) -> float:
+    """
+    Measure how many times per second a function can be called (best of several runs).
+
+    params:
+        function: callable The function to measure.
+        *arguments: any The arguments of the function.
+        repeat: int The number of runs.
+    raises:
+        None
+    returns:
+        float The number of calls per second.
+    """
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*arguments)
+        duration = time.perf_counter() - start
+        if best is None or duration < best: best = duration
+    return 1 / best if best else float("inf")
+
+def conversion_benchmarks() -> dict:
+    """
+    Measure the scalar and batch conversions against the previous inline code.
+
+    params:
+        None
+    raises:
+        None
+    returns:
+        dict The conversions per second of every variant.
+    """
+
+    generator = random.Random(0)
+    colors = [[generator.randrange(256) for _ in range(3)] for _ in range(PALETTE_SIZE)]
+    hex_colors = ["#{:02x}{:02x}{:02x}".format(*color) for color in colors]
+
+    def loop(function, items) -> None:
+        for item in items: function(item)
+
+    results = {
+        "rgb_to_hex.format": per_second(loop, lambda color: "#{:02x}{:02x}{:02x}".format(*color), colors),
+        "rgb_to_hex": per_second(loop, color_conversion.rgb_to_hex, colors),
+        "hex_to_rgb.int": per_second(loop, lambda color: [int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)], hex_colors),
+        "hex_to_rgb": per_second(loop, color_conversion.hex_to_rgb, hex_colors),
+        "scale_brightness.inline": per_second(loop, lambda color: [int(color[0] * (128 / 255)), int(color[1] * (128 / 255)), int(color[2] * (128 / 255))], colors),
+        "scale_brightness": per_second(loop, lambda color: color_conversion.scale_brightness(color, 128), colors),
+        "rgb_to_hex_batch[list]": per_second(color_conversion.rgb_to_hex_batch, colors),
+        "hex_to_rgb_batch[list]": per_second(color_conversion.hex_to_rgb_batch, hex_colors),
+        "rgb_to_hsv_batch[list]": per_second(color_conversion.rgb_to_hsv_batch, colors),
+    }
+    results = {name: round(value * PALETTE_SIZE) for name, value in results.items()} # colors per second
+
+    try:
+        import numpy
+    except ImportError: # numpy is optional, only the list versions are measured
+        return results
+
+    array = numpy.asarray(colors, dtype=numpy.uint8)
+    hsv = color_conversion.rgb_to_hsv_batch(array)
+    for name, function, arguments in (("rgb_to_hex_batch[numpy]", color_conversion.rgb_to_hex_batch, (array,)),
+                                      ("hex_to_rgb_batch[numpy]", lambda colors: color_conversion.hex_to_rgb_batch(colors, as_array=True), (hex_colors,)),
+                                      ("scale_brightness_batch[numpy]", color_conversion.scale_brightness_batch, (array, 128)),
+                                      ("rgb_to_hsv_batch[numpy]", color_conversion.rgb_to_hsv_batch, (array,)),
+                                      ("hsv_to_rgb_batch[numpy]", color_conversion.hsv_to_rgb_batch, (hsv[:, 0], hsv[:, 1], hsv[:, 2]))):
+        results[name] = round(per_second(function, *arguments) * PALETTE_SIZE)
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(conversion_benchmarks(), indent=2))
@@ -0,0 +1,50 @@
+# Drag benchmark for the CTk Color Picker widgets
+# Measures how many <B1-Motion> events per second go through on_mouse_drag, canvas redraw included.
+# Needs a display, on headless machines run it under Xvfb: xvfb-run python benchmarks/bench_drag.py
+
+import os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import customtkinter
+from CTkColorPicker import AskColor, CTkColorPicker
+from harness import drag_path
+
+EVENTS: int = 2000 # number of simulated motion events per run
+
+def events_per_second(picker, count: int = EVENTS) -> float:
+    """
+    Replay a drag path on a picker and measure its throughput.
+
+    params:
+        picker: CTkColorPicker | AskColor The picker to drive.
+        count: int The number of events.
+    raises:
+        None
+    returns:
+        float The number of events handled per second.
+    """
+
+    events = drag_path(picker.image_dimension, count)
+    picker.update()
+
+    start = time.perf_counter()
+    for event in events:
+        picker.on_mouse_drag(event)
+        picker.update_idletasks() # let tk redraw the canvas like it would between two real events
+    return count / (time.perf_counter() - start)
+
+if __name__ == "__main__":
+    root = customtkinter.CTk()
+
+    for width in (200, 300, 500):
+        picker = CTkColorPicker(root, width=width)
+        picker.pack()
+        print(f"CTkColorPicker width={width}: {events_per_second(picker):.0f} events/s")
+        picker.destroy()
+
+        dialog = AskColor(width=width)
+        print(f"AskColor width={width}: {events_per_second(dialog):.0f} events/s")
+        dialog._on_closing()
+
+    root.destroy()
@@ -0,0 +1,58 @@
+# Import time benchmark of the CTk Color Picker package
+# Runs fresh interpreters with "python -X importtime" and sums the cost of the CTkColorPicker modules (dependencies they load included).
+# No display needed: python benchmarks/bench_import.py
+
+import json, os, subprocess, sys
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+STATEMENTS: tuple[str, ...] = ("import CTkColorPicker",
+                               "from CTkColorPicker import wheel_model",
+                               "from CTkColorPicker import CTkColorPicker",
+                               "from CTkColorPicker import AskColor") # import statements measured
+
+def import_time(statement: str, runs: int = 5) -> dict:
+    """
+    Measure the import time of a statement in fresh interpreters.
+
+    params:
+        statement: str The import statement.
+        runs: int The number of interpreters started (the fastest run is kept).
+    raises:
+        subprocess.CalledProcessError if the statement fails
+    returns:
+        dict The cumulative import time in microseconds, the number of modules imported and whether customtkinter and PIL were loaded.
+    """
+
+    best = None
+    for _ in range(runs):
+        process = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=ROOT, capture_output=True, text=True, check=True)
+
+        total, modules = 0, []
+        for line in process.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line: continue
+            _, cumulative, name = line.split("|")
+            if cumulative.strip() == "cumulative": continue # header
+            modules.append(name.strip())
+            if name.startswith(" CTkColorPicker"): total += int(cumulative) # top level entries only, nested imports are already part of their cumulative time
+
+        if best is None or total < best["cumulative_us"]:
+            best = {"cumulative_us": total, "modules": len(modules),
+                    "loads_customtkinter": "customtkinter" in modules, "loads_pil": "PIL" in modules}
+    return best
+
+def import_times() -> dict:
+    """
+    Measure every statement of STATEMENTS.
+
+    params:
+        None
+    raises:
+        subprocess.CalledProcessError if a statement fails
+    returns:
+        dict The results of import_time for every statement.
+    """
+    return {statement: import_time(statement) for statement in STATEMENTS}
+
+if __name__ == "__main__":
+    print(json.dumps(import_times(), indent=2))
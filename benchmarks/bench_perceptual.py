@@ -0,0 +1,96 @@
+# Perceptual (oklch) wheel benchmark of the CTk Color Picker
+# Measures one brightness slider tick of the perceptual wheel at 400px: rendering a lightness level never seen before (gamut table search + render),
+# a level whose gamut table is cached (render only) and a level whose image is cached, plus the scalar color lookup of a drag event.
+# The paste part needs a display (xvfb-run python benchmarks/bench_perceptual.py), without one only the image part is measured.
+
+import json, os, sys, time, tkinter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from PIL import ImageTk
+from CTkColorPicker import image_cache, oklch_model
+
+DIMENSION: int = 400 # wheel size in pixels
+FRAME_BUDGET: float = 1000 / 60 # milliseconds available per frame at 60 fps
+
+def sweep(levels, photo: ImageTk.PhotoImage = None, tables: bool = False, images: bool = False) -> list[float]:
+    """
+    Move the lightness through levels and measure every tick.
+
+    params:
+        levels: iterable[int] The levels, in slider order.
+        photo: ImageTk.PhotoImage Tkinter image the wheel is pasted into (None to skip the paste).
+        tables: bool Keep the gamut tables between ticks (False also measures the gamut search of every level).
+        images: bool Keep the rendered levels between ticks.
+    raises:
+        None
+    returns:
+        list[float] The duration of every tick in milliseconds.
+    """
+
+    durations = []
+    for level in levels:
+        if not tables: oklch_model.gamut_table.cache_clear()
+        if not images: image_cache._lightness_levels.clear()
+
+        start = time.perf_counter()
+        image = image_cache.get_wheel_at_brightness(DIMENSION, 1.0, level, "oklch")
+        if photo is not None: photo.paste(image)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+def summarize(durations: list[float]) -> dict:
+    """
+    Summarize the durations of a sweep.
+
+    params:
+        durations: list[float] The durations in milliseconds.
+    raises:
+        None
+    returns:
+        dict The mean, 95th percentile and max duration in milliseconds and whether the max fits in the frame budget.
+    """
+
+    durations = sorted(durations)
+    return {"mean_ms": round(sum(durations) / len(durations), 4), "p95_ms": round(durations[int(len(durations) * 0.95)], 4),
+            "max_ms": round(durations[-1], 4), "within_frame_budget": durations[-1] < FRAME_BUDGET}
+
+def perceptual_benchmarks(photo: ImageTk.PhotoImage = None) -> dict:
+    """
+    Measure the slider ticks and the color lookups of the perceptual wheel.
+
+    params:
+        photo: ImageTk.PhotoImage Tkinter image the wheel is pasted into (None to skip the paste).
+    raises:
+        None
+    returns:
+        dict The results.
+    """
+
+    oklch_model.render_wheel(DIMENSION, 255) # the lightness independent geometry is computed once, outside of the measure
+    suffix = "+paste" if photo else ""
+    results = {f"uncached_level{suffix}[{DIMENSION}]": summarize(sweep(range(255, -1, -1), photo))}
+    for level in range(oklch_model.LEVELS): oklch_model.gamut_table(level) # every table, as after the slider visited every level once
+    results[f"cached_table{suffix}[{DIMENSION}]"] = summarize(sweep(range(255, -1, -1), photo, tables=True))
+
+    # small slider moves stay within the levels kept by the image cache
+    recent = list(range(128, 128 - image_cache._lightness_levels.maxsize, -1))
+    sweep(recent, tables=True, images=True)
+    results[f"cached_image{suffix}[{DIMENSION}]"] = summarize(sweep(recent * 4, photo, tables=True, images=True))
+
+    points = [(x, y) for x in range(0, DIMENSION, 8) for y in range(0, DIMENSION, 8)]
+    start = time.perf_counter()
+    for x, y in points: oklch_model.coords_to_rgb(x, y, DIMENSION, 128)
+    results["coords_to_rgb.per_second"] = round(len(points) / (time.perf_counter() - start))
+    return results
+
+if __name__ == "__main__":
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError: # no display
+        root = None
+
+    photo = ImageTk.PhotoImage(oklch_model.render_wheel(DIMENSION, 255), master=root) if root else None
+    print(json.dumps(perceptual_benchmarks(photo), indent=2))
+
+    if root: root.destroy()
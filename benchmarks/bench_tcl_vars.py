@@ -0,0 +1,47 @@
+# Tcl variable regression check for the CTkColorPicker widget
+# Simulates 10k drags (and the matching entry updates) and checks that the number of Tcl variables and commands stays flat.
+# Needs a display, on headless machines run it under Xvfb: xvfb-run python benchmarks/bench_tcl_vars.py
+
+from types import SimpleNamespace
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import customtkinter
+from CTkColorPicker import CTkColorPicker
+
+DRAGS: int = 10_000 # number of simulated motion events
+
+def tcl_counts(widget) -> tuple[int, int]:
+    """
+    Count the global Tcl variables and commands of an interpreter.
+
+    params:
+        widget: tkinter.Misc Any widget of the interpreter.
+    raises:
+        None
+    returns:
+        tuple[int, int] The number of variables and the number of commands.
+    """
+    return len(widget.tk.splitlist(widget.tk.call("info", "vars"))), len(widget.tk.splitlist(widget.tk.call("info", "commands")))
+
+if __name__ == "__main__":
+    root = customtkinter.CTk()
+    picker = CTkColorPicker(root, rgb_entries=True)
+    picker.pack()
+    root.update()
+
+    picker.drag_to(10, 10) # warm up (lazily created variables and commands)
+    before = tcl_counts(root)
+
+    center = picker.image_dimension // 2
+    for i in range(DRAGS):
+        picker.on_mouse_drag(SimpleNamespace(x=center + i % center, y=center - i % center))
+        if i % 100 == 0: root.update()
+    root.update()
+
+    after = tcl_counts(root)
+    root.destroy()
+
+    print(f"tcl variables: {before[0]} -> {after[0]}, tcl commands: {before[1]} -> {after[1]} after {DRAGS} drags")
+    sys.exit(0 if after[0] <= before[0] and after[1] <= before[1] else 1) # non zero exit code when variables or commands leaked
@@ -0,0 +1,718 @@
+# Scripted event harness of the CTk Color Picker
+# Replays deterministic event streams (drag paths, typing sequences, slider sweeps, nudge keys) on a picker at a controlled rate,
+# checks the picked color after every event and measures the time each event takes against a per event budget.
+#
+# usage:
+#   python benchmarks/harness.py                                # headless: the real handlers with a fake tk layer, no display needed
+#   xvfb-run python benchmarks/harness.py --target all          # also CTkColorPicker and AskColor on a real tk interpreter
+#   python benchmarks/harness.py --rate 120 --budget-scale 2    # 120 events per second, budgets twice as large (slow machines)
+#
+# The exit status is 1 when a check fails or an event stream goes over its budget, so the harness can guard the hot paths in CI.
+# Every target calls the real event handlers of CTkColorPicker and AskColor with fake events, "headless" on pickers built by their real constructor
+# with the tk layer (after, variables, widgets, canvas, photo images) replaced by fakes, the widget targets on real pickers.
+# Every event is handled to completion: coalesced updates are run (and the canvas is redrawn) before the next one.
+
+from math import cos, sin, tau
+from types import SimpleNamespace
+import argparse, contextlib, json, os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from CTkColorPicker.color_conversion import hex_to_rgb, rgb_to_hex, scale_brightness
+from CTkColorPicker.color_engine import ColorPickerState, NUDGE_KEYS, NUDGE_STEPS, projection_on_circle
+from CTkColorPicker.wheel_model import coords_to_hs
+from CTkColorPicker import image_cache, oklch_model
+from pixel_sampler import PixelSampler, get_sampler
+
+FRAME_BUDGET: float = 1000 / 60 # milliseconds available per frame at 60 fps
+HEADLESS_BUDGET: float = FRAME_BUDGET / 2 # milliseconds per event without tk (the other half of the frame is left to tk and its redraw)
+PERCENTILE: int = 95 # percentile of the event durations compared to the budget (the max is reported, single events can be preempted)
+COLOR_TOLERANCE: int = 4 # largest channel difference between the picked color and the rendered wheel under the target (interpolation)
+TYPED_COLORS: tuple[str, ...] = ("#12ab34", "#ff0000", "#5a3fc0", "#808080", "#fedcba", "#000000") # colors of the typing sequences
+
+class FakeEvent:
+    """
+    Stand-in for tkinter.Event with the attributes read by the pickers.
+    Typing events also carry the text of the edited field after the key and the field itself ("hex" or a rgb channel index).
+    """
+
+    __slots__ = ("x", "y", "keysym", "char", "state", "delta", "num", "text", "field")
+
+    def __init__(self, x: int = 0, y: int = 0, keysym: str = "", char: str = "", state: int = 0, delta: int = 0, num: int = 0, text: str = "", field = "hex") -> None:
+        self.x, self.y = x, y
+        self.keysym, self.char, self.state = keysym, char, state
+        self.delta, self.num = delta, num
+        self.text, self.field = text, field
+
+    def __repr__(self) -> str:
+        return f"FakeEvent(x={self.x}, y={self.y}, keysym={self.keysym!r}, text={self.text!r})"
+
+def drag_path(dimension: int, count: int) -> list[FakeEvent]:
+    """
+    Build a spiral of motion events covering the wheel (and a bit outside of it).
+
+    params:
+        dimension: int The size of the wheel.
+        count: int The number of events.
+    raises:
+        None
+    returns:
+        list[FakeEvent] The motion events.
+    """
+
+    center = dimension / 2
+    return [FakeEvent(x=int(center + (i / count) * dimension * 0.6 * cos(i / 50 * tau)),
+                      y=int(center + (i / count) * dimension * 0.6 * sin(i / 50 * tau))) for i in range(count)]
+
+def typing_sequence(colors = TYPED_COLORS) -> list[FakeEvent]:
+    """
+    Build the key releases of typing colors in the hex entry, one character at a time.
+
+    params:
+        colors: iterable[str] The hex colors typed one after the other.
+    raises:
+        None
+    returns:
+        list[FakeEvent] The key events (the text is the content of the entry after the key).
+    """
+
+    events = []
+    for color in colors:
+        events.append(FakeEvent(keysym="numbersign", char="#", text="#"))
+        events.extend(FakeEvent(keysym=character, char=character, text=color[:i + 2]) for i, character in enumerate(color[1:]))
+    return events
+
+def rgb_typing_sequence(colors = TYPED_COLORS) -> list[FakeEvent]:
+    """
+    Build the key releases of typing colors in the rgb entries, one digit at a time.
+
+    params:
+        colors: iterable[str] The hex colors typed one after the other (as decimal channels).
+    raises:
+        None
+    returns:
+        list[FakeEvent] The key events (the field is the channel index, the text the content of its entry after the key).
+    """
+
+    events = []
+    for color in colors:
+        for channel, value in enumerate(hex_to_rgb(color)):
+            events.extend(FakeEvent(keysym=digit, char=digit, text=str(value)[:i + 1], field=channel) for i, digit in enumerate(str(value)))
+    return events
+
+def slider_sweep(start: int = 255, stop: int = 0) -> list[int]:
+    """
+    Build the values of a brightness slider moved from one end to the other.
+
+    params:
+        start: int The first value.
+        stop: int The last value.
+    raises:
+        None
+    returns:
+        list[int] Every value in between, in order.
+    """
+    return list(range(start, stop - 1, -1) if start >= stop else range(start, stop + 1))
+
+def key_sequence(repeat: int = 20) -> list[FakeEvent]:
+    """
+    Build nudge key presses: held arrows around the wheel, shift steps and page up/down.
+
+    params:
+        repeat: int The number of repeats of each key.
+    raises:
+        None
+    returns:
+        list[FakeEvent] The key events.
+    """
+
+    events = []
+    for keysym, state in (("Right", 0), ("Up", 0), ("Left", 0x1), ("Down", 0), ("Next", 0), ("Prior", 0x1)):
+        events.extend(FakeEvent(keysym=keysym, state=state) for _ in range(repeat))
+    return events
+
+class Scenario:
+    """
+    A named event stream of one kind ("drag", "type", "rgb", "slider" or "key") and its budget per event.
+    """
+
+    def __init__(self, name: str, kind: str, events: list, budget_ms: float) -> None:
+        self.name: str = name
+        self.kind: str = kind
+        self.events: list = events
+        self.budget_ms: float = budget_ms
+
+def default_scenarios(dimension: int, budget_ms: float) -> list[Scenario]:
+    """
+    Get the event streams replayed on every target.
+
+    params:
+        dimension: int The size of the wheel of the target.
+        budget_ms: float The budget of every event in milliseconds.
+    raises:
+        None
+    returns:
+        list[Scenario] The scenarios, in replay order.
+    """
+
+    return [Scenario("drag", "drag", drag_path(dimension, 1000), budget_ms),
+            Scenario("slider", "slider", slider_sweep(255, 0) + slider_sweep(0, 255), budget_ms),
+            Scenario("keys", "key", key_sequence(), budget_ms),
+            Scenario("typing", "type", typing_sequence(), budget_ms),
+            Scenario("rgb_typing", "rgb", rgb_typing_sequence(), budget_ms)]
+
+def wheel_check(state: ColorPickerState, sampler: PixelSampler, live: bool) -> str:
+    """
+    Compare the picked color with the wheel image under the target (the lookups must match what the user sees).
+
+    params:
+        state: ColorPickerState The state of the picker after the event.
+        sampler: PixelSampler Sampler of the wheel image shown by the picker.
+        live: bool The shown image follows the brightness (live brightness and perceptual wheels), otherwise the picked color is the shown one darkened.
+    raises:
+        None
+    returns:
+        str The failure message, None if the color matches.
+    """
+
+    if rgb_to_hex(state.rgb_color) != state.hex_color: return f"hex {state.hex_color} does not match rgb {state.rgb_color}"
+    radius = state.dimension / 2
+    if (state.target_x - radius) ** 2 + (state.target_y - radius) ** 2 > radius ** 2: return f"target {state.position} outside of the wheel"
+
+    expected = sampler.sample(state.target_x, state.target_y)
+    if not live: expected = scale_brightness(expected, state.brightness)
+    if max(abs(a - b) for a, b in zip(expected, state.rgb_color)) > COLOR_TOLERANCE: return f"picked {state.rgb_color}, the wheel shows {expected} at {state.position}"
+    return None
+
+class HandlerDriver:
+    """
+    Replay events on a CTkColorPicker or an AskColor through its real event handlers.
+    The checks run on the state of the picker, the color it shows and the wheel image under its target.
+    """
+
+    def __init__(self, picker, name: str) -> None:
+        self.picker = picker
+        self.name: str = name
+        self.state: ColorPickerState = picker.color_state
+        self.dimension: int = picker.color_state.dimension
+        self._rgb: list[str] = ["0", "0", "0"] # content of the rgb entries
+
+    def supports(self, kind: str) -> bool:
+        if kind == "type": return hasattr(self.picker, "hex_variable") # AskColor has no hex entry
+        if kind == "rgb": return getattr(self.picker, "are_rgb_entries_present", False)
+        return True
+
+    def dispatch(self, kind: str, event) -> None:
+        """
+        Handle one event with the handler tk would call, then settle the picker.
+
+        params:
+            kind: str The kind of the scenario.
+            event: FakeEvent | int The event (the slider value for "slider").
+        raises:
+            None
+        returns:
+            None
+        """
+
+        picker = self.picker
+        if kind == "drag": picker.on_mouse_drag(event)
+        elif kind == "slider":
+            picker.brightness_slider_value.set(event)
+            picker.on_brightness_changed(event)
+        elif kind == "key": picker.on_key_nudge(event)
+        elif kind == "type":
+            picker.hex_variable.set(event.text) # the entry validation only runs on real key presses
+            picker.on_key_released(event)
+        else:
+            self._rgb = [variable.get() for variable in picker.rgb_variables] # the other channels keep the values shown by the picker
+            self._rgb[event.field] = event.text
+            picker.rgb_variables[event.field].set(event.text)
+            picker.on_rgb_key_released(event)
+        self.settle()
+
+    def shown_color(self) -> str:
+        """
+        Get the color the picker shows (the entry of the widget, the label of the dialog).
+        """
+
+        picker = self.picker
+        return picker.entry._fg_color if hasattr(picker, "entry") else picker.label._fg_color
+
+    def wheel_sampler(self) -> tuple[PixelSampler, bool]:
+        """
+        Get a sampler of the wheel image the picker shows and whether that image follows the brightness.
+        """
+
+        picker = self.picker
+        if picker.live_brightness:
+            return PixelSampler(image_cache.get_wheel_at_brightness(picker.image_dimension, picker.image_scaling, picker.shown_brightness, picker.color_space)), True
+        return get_sampler("wheel", picker.image_dimension, picker.image_scaling), False
+
+    def check(self, kind: str, event, before) -> str:
+        """
+        Check the picker after an event.
+
+        params:
+            kind: str The kind of the scenario.
+            event: FakeEvent | int The event.
+            before: tuple The snapshot taken before the event (see snapshot).
+        raises:
+            None
+        returns:
+            str The failure message, None if the picker is correct.
+        """
+
+        picker, state = self.picker, self.state
+        if kind == "type" and len(event.text) < 7: return None # incomplete colors are not picked
+        if self.shown_color() != state.hex_color: return f"the picker shows {self.shown_color()}, its state holds {state.hex_color}"
+
+        if kind in ("type", "rgb"):
+            typed = hex_to_rgb(event.text) if kind == "type" else [int(value) for value in self._rgb]
+            if kind == "rgb" and picker.hex_variable.get() != rgb_to_hex(typed): return f"typed {typed}, the hex entry shows {picker.hex_variable.get()}"
+            return self.typed_check(typed, kind == "type", before)
+
+        if kind == "key":
+            steps, factor = NUDGE_KEYS[event.keysym], 10 if event.state & 0x1 else 1
+            hue, saturation = coords_to_hs(state.target_x, state.target_y, self.dimension)
+            if steps[0] and before[1] > 0.05: # the hue of the center is undefined
+                moved = (hue - before[0] + 0.5) % 1.0 - 0.5
+                expected = steps[0] * factor * NUDGE_STEPS[0]
+                if abs(moved - expected) > 1e-6: return f"hue moved by {moved:.5f} instead of {expected:.5f}"
+            expected = min(max(before[3] + steps[2] * factor * NUDGE_STEPS[2], 0), 255)
+            if picker.brightness_slider_value.get() != expected: return f"slider at {picker.brightness_slider_value.get()} instead of {expected}"
+        if kind == "drag":
+            radius = self.dimension / 2
+            inside = (event.x - radius) ** 2 + (event.y - radius) ** 2 < radius ** 2
+            expected = (event.x, event.y) if inside else projection_on_circle(event.x, event.y, radius, radius, radius - 1)
+            if abs(state.target_x - expected[0]) > 1e-6 or abs(state.target_y - expected[1]) > 1e-6: return f"target at {state.position} instead of {expected}"
+        if kind == "slider":
+            if state.position != before[2]: return f"the slider moved the target from {before[2]} to {state.position}"
+            if state.color_space == "oklch" and state.rgb_color != [0, 0, 0] and abs(oklch_model.rgb_to_level(state.rgb_color) - event) > 2:
+                return f"lightness level {oklch_model.rgb_to_level(state.rgb_color)} of {state.hex_color} instead of {event}"
+        return wheel_check(state, *self.wheel_sampler())
+
+    def typed_check(self, typed: list[int], scaled: bool, before) -> str:
+        """
+        Check the picker after a complete color was typed.
+        On the hsv wheel the slider stays and the color goes to the hue and saturation of the typed one (hex colors are darkened to the slider),
+        on the perceptual wheel the typed color is picked as is and the slider moves to its lightness.
+
+        params:
+            typed: list[int] The typed color.
+            scaled: bool The typed color is darkened to the slider on the hsv wheel (hex entry).
+            before: tuple The snapshot taken before the event.
+        raises:
+            None
+        returns:
+            str The failure message, None if the picker is correct.
+        """
+
+        picker, state = self.picker, self.state
+        slider = picker.brightness_slider_value.get()
+        if state.color_space == "oklch":
+            if state.rgb_color != typed: return f"typed {typed}, the picker holds {state.rgb_color}"
+            if slider != oklch_model.rgb_to_level(typed): return f"slider at {slider} instead of the lightness level {oklch_model.rgb_to_level(typed)} of {typed}"
+            picker.on_brightness_changed(slider) # round trip through the wheel: the slider reports its own value, the color must not change
+            self.settle()
+            if state.rgb_color != typed: return f"typed {typed}, the wheel turned it into {state.rgb_color} at level {slider}"
+            return None
+
+        if slider != before[3]: return f"typing moved the slider from {before[3]} to {slider}"
+        expected = scale_brightness(typed, slider) if scaled else typed
+        if state.rgb_color != expected: return f"typed {typed}, the picker holds {state.rgb_color} instead of {expected}"
+        position = state.find_coords(typed)
+        if max(typed) and (abs(state.target_x - position[0]) > 1e-6 or abs(state.target_y - position[1]) > 1e-6): return f"target of {typed} at {state.position} instead of {position}"
+        return None
+
+    def snapshot(self) -> tuple:
+        hue, saturation = coords_to_hs(self.state.target_x, self.state.target_y, self.dimension)
+        return hue, saturation, self.state.position, self.picker.brightness_slider_value.get()
+
+    def settle(self) -> None:
+        pass
+
+    def wait(self, seconds: float) -> None:
+        if seconds > 0: time.sleep(seconds)
+
+    def close(self) -> None:
+        pass
+
+class FakeScheduler:
+    """
+    Stand-in for the after, after_idle and after_cancel methods of a widget: callbacks are queued until run() (delays are ignored).
+    """
+
+    def __init__(self) -> None:
+        self.jobs: dict = {} # id -> (callback, arguments), in scheduling order
+        self._count: int = 0
+
+    def after(self, ms: int, func = None, *args) -> str:
+        if func is None: return None # tk would only sleep
+        self._count += 1
+        job = f"after#{self._count}"
+        self.jobs[job] = (func, args)
+        return job
+
+    def after_idle(self, func, *args) -> str:
+        return self.after(0, func, *args)
+
+    def after_cancel(self, job: str) -> None:
+        self.jobs.pop(job, None)
+
+    def run(self) -> None:
+        """
+        Run the queued callbacks, and the ones they schedule, until the queue is empty.
+        """
+
+        while self.jobs:
+            func, args = self.jobs.pop(next(iter(self.jobs)))
+            func(*args)
+
+class FakeVariable:
+    """
+    Stand-in for the tkinter variables.
+    """
+
+    def __init__(self, master = None, value = None) -> None:
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value) -> None:
+        self.value = value
+
+class FakeWidget:
+    """
+    Stand-in for the customtkinter widgets created by the pickers (the options are only recorded, fg_color where customtkinter keeps it).
+    """
+
+    _count: int = 0
+
+    def __init__(self, master = None, **options) -> None:
+        FakeWidget._count += 1
+        self.name: str = f".fake{FakeWidget._count}"
+        self.textvariable: FakeVariable = options.get("textvariable")
+        self.options: dict = {}
+        self.bindings: dict = {}
+        self.configure(**options)
+
+    def configure(self, **options) -> None:
+        self.options.update(options)
+        if "fg_color" in options: self._fg_color = options["fg_color"]
+
+    def bind(self, sequence: str, func, add = None) -> None:
+        self.bindings[sequence] = func
+
+    def get(self) -> str:
+        return self.textvariable.get()
+
+    def pack(self, **options) -> None:
+        pass
+
+    grid = pack
+
+    def focus(self) -> None:
+        pass
+
+    def __str__(self) -> str:
+        return self.name
+
+class FakeCanvas(FakeWidget):
+    """
+    Stand-in for the canvas of the pickers, it keeps the coordinates and options of its items.
+    """
+
+    def __init__(self, master = None, **options) -> None:
+        super().__init__(master, **options)
+        self.coordinates: dict = {}
+        self.item_options: dict = {}
+
+    def create_image(self, x: float, y: float, **options) -> int:
+        item = len(self.coordinates) + 1
+        self.coordinates[item], self.item_options[item] = (x, y), options
+        return item
+
+    def coords(self, item: int, *coordinates) -> None:
+        self.coordinates[item] = coordinates
+
+    def itemconfigure(self, item: int, **options) -> None:
+        self.item_options[item].update(options)
+
+    def focus_set(self) -> None:
+        pass
+
+class FakePhoto:
+    """
+    Stand-in for ImageTk.PhotoImage, it keeps the PIL image shown.
+    """
+
+    def __init__(self, image, master = None) -> None:
+        self.image = image
+
+    def paste(self, image) -> None:
+        self.image = image
+
+class FakeWindow:
+    """
+    Stand-in for the tk methods the pickers call on themselves (their customtkinter base classes need a tk interpreter).
+    Its methods are set on the picker instance, where they take precedence over the methods of the base classes.
+    """
+
+    IGNORED: tuple[str, ...] = ("title", "maxsize", "minsize", "resizable", "transient", "lift", "grid_columnconfigure", "grid_rowconfigure", "protocol",
+                                "grab_set", "grab_release", "deiconify", "withdraw", "focus", "update_idletasks") # window management, nothing to record
+
+    def __init__(self, scheduler: FakeScheduler) -> None:
+        self.scheduler: FakeScheduler = scheduler
+        self.options: dict = {}
+
+    def attach(self, picker) -> None:
+        """
+        Set the fake methods and the attributes of the customtkinter base class on a picker that is not initialized yet.
+        """
+
+        picker.after, picker.after_idle, picker.after_cancel = self.scheduler.after, self.scheduler.after_idle, self.scheduler.after_cancel
+        picker.configure = picker.config = self.configure
+        picker.register = self.register
+        picker._apply_window_scaling = picker._apply_widget_scaling = self.scaled
+        picker._get_window_scaling = picker._get_widget_scaling = self.scaling
+        picker._apply_appearance_mode = self.appearance_color
+        for name in self.IGNORED: setattr(picker, name, self.ignore)
+        picker.master, picker._w, picker._fg_color = self, ".picker", "#dbdbdb"
+
+    def configure(self, **options) -> None:
+        self.options.update(options)
+
+    def register(self, func, *args) -> str:
+        return f"command{id(func)}"
+
+    def scaled(self, value: float) -> float:
+        return value
+
+    def scaling(self) -> float:
+        return 1.0
+
+    def appearance_color(self, color):
+        return color[0] if isinstance(color, (list, tuple)) else color # the light mode color
+
+    def ignore(self, *args, **kwargs) -> None:
+        pass
+
+@contextlib.contextmanager
+def fake_tk():
+    """
+    Replace the tk layer of the picker modules while a picker is built: tkinter and customtkinter widgets, variables and images become fakes,
+    and the constructors of the customtkinter base classes do nothing (FakeWindow provides what the pickers call on themselves).
+    """
+
+    import customtkinter, tkinter
+    from CTkColorPicker import ctk_color_picker, ctk_color_picker_widget, picker_view
+
+    fake_tkinter = SimpleNamespace(Canvas=FakeCanvas, BooleanVar=FakeVariable, IntVar=FakeVariable, StringVar=FakeVariable, Frame=tkinter.Frame, TclError=tkinter.TclError)
+    fake_customtkinter = SimpleNamespace(CTkSlider=FakeWidget, CTkLabel=FakeWidget, CTkEntry=FakeWidget, CTkButton=FakeWidget, CTkFrame=FakeWidget,
+                                         IntVar=FakeVariable, StringVar=FakeVariable, ThemeManager=customtkinter.ThemeManager)
+    patches = [(module, "tkinter", fake_tkinter) for module in (ctk_color_picker, ctk_color_picker_widget)]
+    patches += [(module, "customtkinter", fake_customtkinter) for module in (ctk_color_picker, ctk_color_picker_widget)]
+    patches += [(customtkinter.CTkToplevel, "__init__", lambda self, *args, **kwargs: None), (customtkinter.CTkFrame, "__init__", lambda self, *args, **kwargs: None)]
+    patches += [(picker_view, "ImageTk", SimpleNamespace(PhotoImage=FakePhoto)),
+                (picker_view, "get_photo_image", lambda asset, dimension, scaling, master, cache_dir=None: FakePhoto(image_cache.get_image(asset, dimension, scaling, cache_dir)))]
+
+    saved = [(target, name, target.__dict__[name]) for target, name, _ in patches]
+    for target, name, value in patches: setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for target, name, value in saved: setattr(target, name, value)
+
+def headless_picker(cls, width: int, color_space: str):
+    """
+    Build a picker through its real constructor with the tk layer replaced by fakes, so its real handlers run without a display.
+    The canvas is then "mapped": its <Map> binding loads the images, like tk does when the picker is shown.
+
+    params:
+        cls: type CTkColorPicker or AskColor.
+        width: int The width of the picker.
+        color_space: str "rgb" or "oklch".
+    raises:
+        None
+    returns:
+        tuple The picker and the FakeScheduler of its after calls.
+    """
+
+    from CTkColorPicker import CTkColorPicker
+    from CTkColorPicker.instrumentation import Instrumentation
+
+    scheduler = FakeScheduler()
+    window = FakeWindow(scheduler)
+    picker = cls.__new__(cls)
+    window.attach(picker)
+    with fake_tk():
+        if cls is CTkColorPicker: picker.__init__(window, width=width, rgb_entries=True, color_space=color_space, instrumentation=Instrumentation(), command=lambda color: None)
+        else: picker.__init__(width=width, color_space=color_space, modal=False, instrumentation=Instrumentation())
+        picker.canvas.bindings["<Map>"](None)
+    scheduler.run()
+    return picker, scheduler
+
+class HeadlessDriver(HandlerDriver):
+    """
+    Replay events on the real handlers of a picker built by headless_picker (no display needed).
+    The coalesced updates are run from the fake scheduler and the checks read the image the picker pasted in its wheel.
+    """
+
+    def __init__(self, cls, width: int, color_space: str) -> None:
+        picker, self.scheduler = headless_picker(cls, width, color_space)
+        super().__init__(picker, f"headless {cls.__name__}")
+        self._samplers: dict = {} # id of a shown image -> (image, sampler), the image is kept so its id is not reused
+
+    def settle(self) -> None:
+        self.scheduler.run()
+
+    def wheel_sampler(self) -> tuple[PixelSampler, bool]:
+        image = self.picker.wheel.image
+        if id(image) not in self._samplers: self._samplers[id(image)] = (image, PixelSampler(image))
+        return self._samplers[id(image)][1], self.picker.live_brightness
+
+    def close(self) -> None:
+        self.picker._cancel_drag()
+
+class WidgetDriver(HandlerDriver):
+    """
+    Replay events on a CTkColorPicker or an AskColor on a real tk interpreter (needs a display, Xvfb works).
+    """
+
+    def __init__(self, picker, name: str) -> None:
+        super().__init__(picker, name)
+        self.picker.update()
+
+    def settle(self) -> None:
+        """
+        Run the coalesced updates scheduled by the event and let tk redraw, so the next event starts from an idle picker.
+        """
+
+        picker = self.picker
+        for job, flush in (("_drag_job", "_flush_drag"), ("_nudge_job", "_flush_nudge")):
+            if getattr(picker, job, None) is not None:
+                picker.after_cancel(getattr(picker, job))
+                getattr(picker, flush)()
+        picker.update_idletasks()
+
+    def wait(self, seconds: float) -> None:
+        # keep the event loop running between two events, like tk does between real events
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            self.picker.update()
+            time.sleep(0.001)
+
+    def close(self) -> None:
+        if hasattr(self.picker, "_on_closing"): self.picker._on_closing()
+        else: self.picker.destroy()
+
+def replay(driver: HandlerDriver, scenario: Scenario, rate: float = None) -> dict:
+    """
+    Replay a scenario on a driver, checking and timing every event.
+
+    params:
+        driver: HandlerDriver The target.
+        scenario: Scenario The event stream.
+        rate: float The number of events per second (None replays them back to back).
+    raises:
+        None
+    returns:
+        dict The number of events, the mean, percentile and max duration in milliseconds, the failures (at most 10) and whether the scenario passed.
+    """
+
+    durations, failures = [], []
+    interval = 1 / rate if rate else 0.0
+    start = time.perf_counter()
+
+    for index, event in enumerate(scenario.events):
+        if interval: driver.wait(start + index * interval - time.perf_counter())
+        before = driver.snapshot()
+
+        begin = time.perf_counter()
+        driver.dispatch(scenario.kind, event)
+        durations.append((time.perf_counter() - begin) * 1000)
+
+        failure = driver.check(scenario.kind, event, before)
+        if failure is not None: failures.append(f"event {index} {event!r}: {failure}")
+
+    ordered = sorted(durations)
+    percentile = ordered[min(int(len(ordered) * PERCENTILE / 100), len(ordered) - 1)]
+    return {"events": len(durations), "mean_ms": round(sum(durations) / len(durations), 4), f"p{PERCENTILE}_ms": round(percentile, 4), "max_ms": round(ordered[-1], 4),
+            "budget_ms": round(scenario.budget_ms, 4), "failures": failures[:10], "passed": not failures and percentile <= scenario.budget_ms}
+
+def run(driver: HandlerDriver, budget_ms: float, rate: float = None) -> dict:
+    """
+    Replay every supported default scenario on a driver.
+
+    params:
+        driver: HandlerDriver The target.
+        budget_ms: float The budget of every event in milliseconds.
+        rate: float The number of events per second (None replays them back to back).
+    raises:
+        None
+    returns:
+        dict The report of every scenario, by name.
+    """
+    return {scenario.name: replay(driver, scenario, rate) for scenario in default_scenarios(driver.dimension, budget_ms) if driver.supports(scenario.kind)}
+
+def drivers(target: str, width: int, color_space: str):
+    """
+    Create the drivers of a target, one at a time (the previous one is closed before the next is created).
+
+    params:
+        target: str "headless", "widget", "dialog" or "all".
+        width: int The width of the pickers.
+        color_space: str "rgb" or "oklch".
+    raises:
+        tkinter.TclError if a widget target has no display
+    returns:
+        iterator[tuple[HandlerDriver, float]] The drivers and their budget per event in milliseconds.
+    """
+
+    import customtkinter
+    from CTkColorPicker import AskColor, CTkColorPicker
+    from CTkColorPicker.instrumentation import Instrumentation
+
+    if target in ("headless", "all"):
+        yield HeadlessDriver(CTkColorPicker, width, color_space), HEADLESS_BUDGET
+        yield HeadlessDriver(AskColor, width, color_space), HEADLESS_BUDGET
+    if target == "headless": return
+
+    root = customtkinter.CTk()
+    try:
+        if target in ("widget", "all"):
+            picker = CTkColorPicker(root, width=width, rgb_entries=True, color_space=color_space, instrumentation=Instrumentation(), command=lambda color: None)
+            picker.pack()
+            yield WidgetDriver(picker, "CTkColorPicker"), FRAME_BUDGET
+        if target in ("dialog", "all"):
+            yield WidgetDriver(AskColor(width=width, color_space=color_space, modal=False, instrumentation=Instrumentation()), "AskColor"), FRAME_BUDGET
+    finally:
+        root.destroy()
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay scripted event streams on the CTk Color Picker and check correctness and time budgets")
+    parser.add_argument("--target", choices=("headless", "widget", "dialog", "all"), default="headless", help="what to drive (widget and dialog need a display)")
+    parser.add_argument("--width", type=int, default=300, help="width of the pickers")
+    parser.add_argument("--color-space", choices=("rgb", "oklch"), default="rgb", help="wheel model of the pickers")
+    parser.add_argument("--rate", type=float, help="events per second (default: back to back)")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="multiply every budget (slow or shared machines)")
+    arguments = parser.parse_args()
+
+    report, passed = {}, True
+    for driver, budget_ms in drivers(arguments.target, arguments.width, arguments.color_space):
+        try:
+            results = run(driver, budget_ms * arguments.budget_scale, arguments.rate)
+            instrumentation = getattr(driver.picker, "instrumentation", None)
+            if instrumentation: results["instrumentation"] = instrumentation.summary()
+        finally:
+            driver.close()
+        report[driver.name] = results
+        passed = passed and all(result["passed"] for name, result in results.items() if name != "instrumentation")
+
+    print(json.dumps({"passed": passed, "results": report}, indent=2))
+    return 0 if passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+# Pixel sampler of the CTk Color Picker benchmarks
+# Reads colors from a rendered image (the pickers use the closed form wheel model instead), used as the reference of the harness checks
+# and to compare sampling the bitmap with four getpixel calls.
+
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from PIL import Image
+from CTkColorPicker import image_cache
+
+_samplers: image_cache.LRUCache = image_cache.LRUCache(maxsize=8) # (asset, dimension, scaling) -> PixelSampler of the image
+
+class PixelSampler:
+    """
+    Color lookups on a preloaded image: coordinates are clamped to the image and interpolated bilinearly.
+    Pixels are weighted by their alpha, so points near an anti-aliased rim keep the color of the rim instead of fading to the transparent pixels.
+    """
+
+    __slots__ = ("width", "height", "data")
+
+    def __init__(self, image: Image.Image) -> None:
+        self.width, self.height = image.size
+        self.data: bytes = image.convert("RGBA").tobytes() # RGBA rows, indexing bytes is much cheaper than getpixel or a pixel access object
+
+    def sample(self, x: float, y: float) -> list[int]:
+        """
+        Get the color at a point of the image.
+
+        params:
+            x: float The x-coordinate of the point (clamped to the image).
+            y: float The y-coordinate of the point (clamped to the image).
+        raises:
+            None
+        returns:
+            list[int] The color [r, g, b] ([0, 0, 0] if the four surrounding pixels are transparent).
+        """
+
+        width, data = self.width, self.data
+        x = min(max(x, 0.0), width - 1.0)
+        y = min(max(y, 0.0), self.height - 1.0)
+        x0, y0 = int(x), int(y)
+        fx, fy = x - x0, y - y0
+
+        # offsets of the four surrounding pixels (the last row and column are their own neighbours)
+        i00 = (y0 * width + x0) * 4
+        i10 = i00 + 4 if x0 < width - 1 else i00
+        i01 = i00 + width * 4 if y0 < self.height - 1 else i00
+        i11 = i01 + (i10 - i00)
+
+        w00, w10 = (1 - fx) * (1 - fy) * data[i00 + 3], fx * (1 - fy) * data[i10 + 3]
+        w01, w11 = (1 - fx) * fy * data[i01 + 3], fx * fy * data[i11 + 3]
+        total = w00 + w10 + w01 + w11
+        if not total: return [0, 0, 0]
+
+        return [round((data[i00] * w00 + data[i10] * w10 + data[i01] * w01 + data[i11] * w11) / total),
+                round((data[i00 + 1] * w00 + data[i10 + 1] * w10 + data[i01 + 1] * w01 + data[i11 + 1] * w11) / total),
+                round((data[i00 + 2] * w00 + data[i10 + 2] * w10 + data[i01 + 2] * w01 + data[i11 + 2] * w11) / total)]
+
+def get_sampler(asset: str, dimension: int, scaling: float = 1.0) -> PixelSampler:
+    """
+    Get the sampler of the image of an asset, loaded once per size.
+
+    params:
+        asset: str "wheel" or "target".
+        dimension: int The size of the image (already scaled).
+        scaling: float The scaling factor the dimension was computed with.
+    raises:
+        ValueError if the asset is unknown
+    returns:
+        PixelSampler The sampler.
+    """
+    return _samplers.get((asset, dimension, scaling), lambda: PixelSampler(image_cache.get_image(asset, dimension, scaling)))
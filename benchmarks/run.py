@@ -0,0 +1,222 @@
+# Benchmark suite of the CTk Color Picker hot paths
+# Prints the results as JSON so runs of different versions can be compared.
+#
+# usage:
+#   python benchmarks/run.py [--mode logic|gui|all] [--output results.json]
+#
+# "logic" only measures the import time, the color math and conversions and the image generation and runs without a display.
+# "gui" builds real widgets, on headless machines run it under Xvfb: xvfb-run python benchmarks/run.py --mode gui
+
+from types import SimpleNamespace
+import argparse, contextlib, importlib.util, json, os, platform, sys, tempfile, time, tkinter, tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import CTkColorPicker
+from CTkColorPicker import image_cache, wheel_model
+from CTkColorPicker.color_conversion import hex_to_rgb_batch
+from CTkColorPicker.color_engine import ColorPickerState
+from pixel_sampler import get_sampler
+
+WIDTHS: tuple[int, ...] = (200, 300, 500) # widget widths measured
+COLORS: tuple[str, ...] = ("#ffffff", "#ff0000", "#12ab34", "#5a3fc0", "#808080", "#000000") # colors used for the lookups
+
+def measure(function, repeat: int) -> dict:
+    """
+    Call a function several times and summarize the durations.
+
+    params:
+        function: callable Function without arguments to measure.
+        repeat: int The number of calls.
+    raises:
+        None
+    returns:
+        dict The mean, min and max duration in milliseconds and the number of calls per second.
+    """
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    mean = sum(durations) / len(durations)
+    return {"mean_ms": round(mean, 4), "min_ms": round(min(durations), 4), "max_ms": round(max(durations), 4), "per_second": round(1000 / mean, 1) if mean else None}
+
+def logic_benchmarks() -> dict:
+    """
+    Benchmarks that do not need a display.
+
+    params:
+        None
+    raises:
+        None
+    returns:
+        dict The results.
+    """
+
+    results = {}
+    for width in WIDTHS:
+        dimension = width - 100
+        results[f"render_wheel[{dimension}]"] = measure(lambda: wheel_model.render_wheel(dimension), 5)
+
+        # the wheel of a new process when it was persisted by a previous one
+        with tempfile.TemporaryDirectory() as cache_dir:
+            image_cache.get_image("wheel", dimension, 1.0, cache_dir)
+            results[f"wheel_from_disk_cache[{dimension}]"] = measure(lambda: (image_cache.clear(), image_cache.get_image("wheel", dimension, 1.0, cache_dir)), 20)
+            image_cache.clear()
+
+        colors = hex_to_rgb_batch(COLORS)
+        results[f"rgb_to_coords[{dimension}]"] = measure(lambda: [wheel_model.rgb_to_coords(color, dimension) for color in colors], 1000)
+        results[f"coords_to_rgb[{dimension}]"] = measure(lambda: wheel_model.coords_to_rgb(dimension / 3, dimension / 4, dimension), 1000)
+
+        # sampling the rendered wheel at sub-pixel positions: four getpixel calls against the preloaded sampler
+        wheel, sampler = image_cache.get_image("wheel", dimension), get_sampler("wheel", dimension)
+        x, y = dimension / 3 + 0.25, dimension / 4 + 0.75
+        results[f"getpixel_x4[{dimension}]"] = measure(lambda: [wheel.getpixel((int(x) + i, int(y) + j)) for i in (0, 1) for j in (0, 1)], 1000)
+        results[f"PixelSampler.sample[{dimension}]"] = measure(lambda: sampler.sample(x, y), 1000)
+
+        # the drag and lookup hot paths of both widgets, without tkinter
+        state = ColorPickerState(dimension)
+        points = iter([(i % dimension, (i * 7) % dimension) for i in range(5000)])
+        results[f"ColorPickerState.move_to[{dimension}]"] = measure(lambda: state.move_to(*next(points)), 5000)
+        brightness_levels = iter(list(range(256)) * 10)
+        results[f"ColorPickerState.set_brightness[{dimension}]"] = measure(lambda: state.set_brightness(next(brightness_levels)), 2560)
+        states = iter(colors * 500)
+        results[f"ColorPickerState.set_color[{dimension}]"] = measure(lambda: state.set_color(next(states)), 3000)
+
+        image_cache._brightness_levels.clear()
+        levels = iter(range(256))
+        results[f"wheel_at_brightness[{dimension}]"] = measure(lambda: image_cache.get_wheel_at_brightness(dimension, 1.0, next(levels)), 255)
+    return results
+
+def displayed(widget):
+    """
+    Build the images of a picker the way its first display does (the canvas <Map> event), so the measures include them.
+
+    params:
+        widget: CTkColorPicker | AskColor The picker.
+    raises:
+        None
+    returns:
+        CTkColorPicker | AskColor The same picker.
+    """
+
+    widget.load_images()
+    return widget
+
+def gui_benchmarks() -> dict:
+    """
+    Benchmarks building real widgets (needs a display).
+
+    params:
+        None
+    raises:
+        None
+    returns:
+        dict The results.
+    """
+
+    import customtkinter
+    from bench_drag import events_per_second
+
+    results = {}
+    root = customtkinter.CTk()
+
+    for width in WIDTHS:
+        image_cache.clear()
+        start = time.perf_counter()
+        picker = displayed(CTkColorPicker.CTkColorPicker(root, width=width, rgb_entries=True))
+        results[f"CTkColorPicker.__init__[{width}].first_ms"] = round((time.perf_counter() - start) * 1000, 4)
+
+        # construction cost and memory of a picker when the images are already cached
+        tracemalloc.start()
+        pickers = []
+        results[f"CTkColorPicker.__init__[{width}]"] = measure(lambda: pickers.append(displayed(CTkColorPicker.CTkColorPicker(root, width=width, rgb_entries=True))), 10)
+        results[f"CTkColorPicker.memory_per_instance[{width}].kib"] = round(tracemalloc.get_traced_memory()[0] / len(pickers) / 1024, 2)
+        tracemalloc.stop()
+        for other in pickers: other.destroy()
+
+        picker.pack()
+        root.update()
+        results[f"CTkColorPicker.on_mouse_drag[{width}].events_per_second"] = round(events_per_second(picker, 500), 1)
+
+        colors = iter(hex_to_rgb_batch(COLORS) * 100)
+        results[f"CTkColorPicker.find_color_coords[{width}]"] = measure(lambda: picker.find_color_coords(next(colors)), 600)
+        hex_colors = iter(COLORS * 100)
+        results[f"CTkColorPicker.set_initial_color[{width}]"] = measure(lambda: picker.set_initial_color(next(hex_colors)), 600)
+
+        # typing a color in the hex entry, one key release per character
+        def type_color(color: str) -> None:
+            picker.entry.delete(0, "end")
+            picker.entry.insert(0, "#")
+            for character in color[1:]:
+                picker.entry.insert("end", character)
+                picker.on_key_released(SimpleNamespace(keysym=character))
+        results[f"CTkColorPicker.on_key_released[{width}].per_color"] = measure(lambda: type_color("#12ab34"), 50)
+        picker.destroy()
+
+        image_cache.clear()
+        start = time.perf_counter()
+        dialog = displayed(CTkColorPicker.AskColor(width=width, initial_color="#5a3fc0"))
+        results[f"AskColor.__init__[{width}].first_ms"] = round((time.perf_counter() - start) * 1000, 4)
+        dialog.update()
+        results[f"AskColor.on_mouse_drag[{width}].events_per_second"] = round(events_per_second(dialog, 500), 1)
+        hex_colors = iter(COLORS * 100)
+        results[f"AskColor.set_initial_color[{width}]"] = measure(lambda: dialog.set_initial_color(next(hex_colors)), 600)
+        dialog._on_closing()
+
+        # a pooled dialog is only hidden on close, the next opens reuse it
+        pooled = CTkColorPicker.AskColor.pooled(width=width, initial_color="#5a3fc0")
+        pooled.update()
+        pooled._on_closing()
+        results[f"AskColor.pooled[{width}].reopen"] = measure(lambda: CTkColorPicker.AskColor.pooled(width=width, initial_color="#12ab34")._on_closing(), 50)
+        pooled.destroy()
+
+    # a form of many pickers managed by a group (shared images, one batched command per frame)
+    image_cache.clear()
+    group = CTkColorPicker.PickerGroup(root, command=lambda changes: None)
+    start = time.perf_counter()
+    for i in range(40): displayed(group.create(f"series {i}", width=200))
+    results["PickerGroup.create[40]"] = round((time.perf_counter() - start) * 1000, 4)
+    colors = {name: COLORS[i % len(COLORS)] for i, name in enumerate(group.members)}
+    results["PickerGroup.set[40]"] = measure(lambda: group.set(colors), 10)
+    results["PickerGroup.get[40]"] = measure(group.get, 100)
+    group.cancel()
+
+    root.destroy()
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the CTk Color Picker hot paths")
+    parser.add_argument("--mode", choices=("logic", "gui", "all"), default="all", help="which benchmarks to run (gui needs a display)")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    arguments = parser.parse_args()
+
+    report = {"version": CTkColorPicker.__version__, "python": platform.python_version(), "platform": platform.platform(),
+              "numpy": importlib.util.find_spec("numpy") is not None, "results": {}}
+
+    if arguments.mode in ("logic", "all"):
+        from bench_import import import_times
+        from bench_conversion import conversion_benchmarks
+        from bench_perceptual import perceptual_benchmarks
+        report["results"]["logic"] = logic_benchmarks()
+        report["results"]["import"] = import_times()
+        report["results"]["conversion"] = conversion_benchmarks()
+        report["results"]["perceptual"] = perceptual_benchmarks()
+    if arguments.mode in ("gui", "all"):
+        try:
+            with contextlib.redirect_stdout(sys.stderr): # keep stdout for the JSON report
+                report["results"]["gui"] = gui_benchmarks()
+        except tkinter.TclError as error: # no display, keep the logic results
+            if arguments.mode == "gui": raise
+            report["results"]["gui"] = {"skipped": str(error)}
+
+    output = json.dumps(report, indent=2)
+    if arguments.output:
+        with open(arguments.output, "w") as file: file.write(output)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()